@@ -0,0 +1,41 @@
+"""add_product_search_vector
+
+Revision ID: dfb55e8426c3
+Revises: a08431b462b4
+Create Date: 2026-10-16 10:12:43.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dfb55e8426c3'
+down_revision: Union[str, Sequence[str], None] = 'a08431b462b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Full-text search is PostgreSQL only; other databases keep ILIKE search
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        "ALTER TABLE products ADD COLUMN search_vec TSVECTOR "
+        "GENERATED ALWAYS AS (to_tsvector('simple', "
+        "coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+    )
+    op.create_index('idx_products_search', 'products', ['search_vec'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('idx_products_search', table_name='products')
+    op.drop_column('products', 'search_vec')
@@ -2,6 +2,7 @@
 Product management API routes with performance optimizations
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from typing import List, Optional
@@ -17,7 +18,7 @@ from ..schemas.product import (
 )
 from ..dependencies import get_current_user
 from ..utils.query_optimizer import OptimizedQueries, QueryOptimizer
-from ..utils.cache import cache_products, cache_categories, invalidate_product_cache
+from ..utils.cache import cache_categories, invalidate_product_cache
 
 router = APIRouter(
     prefix="/products", 
@@ -44,7 +45,6 @@ logger = logging.getLogger(__name__)
         },
     },
 )
-@cache_products(ttl=300)  # Cache for 5 minutes
 async def get_products(
     page: int = Query(1, ge=1, description="Page number (starting from 1)"),
     per_page: int = Query(10, ge=1, le=100, description="Number of items per page (max 100)"),
@@ -56,6 +56,7 @@ async def get_products(
     seller_id: Optional[str] = Query(None, description="Filter by seller UUID"),
     sort_by: str = Query("created_at", description="Field to sort by (created_at, price, title)"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order (asc/desc)"),
+    after_id: Optional[str] = Query(None, description="Cursor: return products after this product ID (keyset pagination)"),
     db: Session = Depends(get_db)
 ) -> ProductListResponse:
     """
@@ -66,7 +67,6 @@ async def get_products(
     - **Search**: Full-text search in product titles and descriptions  
     - **Filtering**: Filter by category, price range, status, and seller
     - **Sorting**: Sort by multiple fields in ascending/descending order
-    - **Caching**: Results cached for 5 minutes for optimal performance
     
     **Query Parameters:**
     - `page`: Page number (1-based indexing)
@@ -78,6 +78,7 @@ async def get_products(
     - `seller_id`: Filter by specific seller
     - `sort_by`: Field for sorting (created_at, price, title)
     - `sort_order`: Sort direction (asc, desc)
+    - `after_id`: Keyset cursor for infinite scroll (use `next_cursor` from the previous page)
     
     **Response:**
     - Array of products with full details
@@ -87,8 +88,18 @@ async def get_products(
     # Calculate offset
     skip = (page - 1) * per_page
     
+    # Resolve keyset cursor from the anchor product
+    cursor_value = cursor_id = None
+    if after_id:
+        anchor = db.query(Product).filter(Product.id == after_id).first()
+        if not anchor:
+            # `status` is shadowed by the query parameter here
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        sort_column = getattr(Product, sort_by, Product.created_at)
+        cursor_value, cursor_id = getattr(anchor, sort_column.key), anchor.id
+    
     # Use optimized query method
-    products, total_count = OptimizedQueries.get_products_with_pagination(
+    products, total_count, next_cursor = OptimizedQueries.get_products_with_pagination(
         db=db,
         skip=skip,
         limit=per_page,
@@ -98,18 +109,23 @@ async def get_products(
         search=search,
         status=status if status != "all" else "available",
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor_value=cursor_value,
+        cursor_id=cursor_id
     )
     
-    # Calculate pagination info
-    total_pages = (total_count + per_page - 1) // per_page
+    # Calculate pagination info (unknown when paginating by cursor)
+    total_pages = None
+    if total_count is not None:
+        total_pages = (total_count + per_page - 1) // per_page
     
     return ProductListResponse(
         products=[ProductResponse.model_validate(p) for p in products],
         total=total_count,
         page=page,
         per_page=per_page,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor[1] if next_cursor else None
     )
 
 
@@ -343,6 +359,10 @@ async def delete_product(
     try:
         db.delete(product)
         db.commit()
+        
+        # Invalidate relevant caches
+        invalidate_product_cache(product_id)
+        
         return {"message": "Product deleted successfully", "product_id": product_id}
     except Exception as e:
         db.rollback()
@@ -394,3 +414,29 @@ async def get_seller_products(
         per_page=per_page,
         total_pages=total_pages
     )
+
+
+@router.get("/seller/{seller_id}/export")
+async def export_seller_products(
+    seller_id: str,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(available|sold|pending)$"),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream all products by a specific seller as newline-delimited JSON
+    """
+    # Verify seller exists
+    seller = db.query(User).filter(User.id == seller_id).first()
+    if not seller:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Seller not found"
+        )
+    
+    products = OptimizedQueries.iter_user_products(db, seller_id, status_filter)
+    
+    def generate():
+        for product in products:
+            yield ProductResponse.model_validate(product).model_dump_json() + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -60,10 +60,11 @@ class ProductWithDetails(ProductResponse):
 class ProductListResponse(BaseModel):
     """Schema for paginated product list response"""
     products: List[ProductResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Product ID to pass as after_id for the next page")
 
 
 class ProductFilter(BaseModel):
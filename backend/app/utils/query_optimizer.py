@@ -1,8 +1,10 @@
 """
 Query optimization utilities for improved database performance
 """
-from typing import Optional, List, Dict, Any, Type, Union
-from sqlalchemy import text, desc, asc, and_, or_
+from typing import Optional, List, Dict, Any, Type, Union, Tuple, Iterable
+from sqlalchemy import text, desc, asc, and_, or_, tuple_, literal_column, select, table, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session, Query, joinedload, selectinload
 from sqlalchemy.sql import func
 from functools import wraps
@@ -10,28 +12,64 @@ import time
 import logging
 from contextlib import contextmanager
 
-from .models.product import Product
-from .models.user import User  
-from .models.category import Category
+from ..models.product import Product
+from ..models.user import User
+from ..models.category import Category
+from .cache import InMemoryCache
 
 logger = logging.getLogger(__name__)
 
+# Generated tsvector column added by migration dfb55e8426c3 (PostgreSQL only,
+# so it is not mapped on the model)
+_SEARCH_VECTOR = literal_column("products.search_vec")
+
+# Whether each database (by URL) has the search vector column
+_search_vector_available: Dict[str, bool] = {}
+
+def _has_search_vector(db: Session) -> bool:
+    """
+    Check whether the session's database has the full-text search vector
+    
+    Only PostgreSQL databases migrated with Alembic have it; a schema built
+    by create_tables() does not, so searches there keep using ILIKE. Checked
+    once per database.
+    """
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _search_vector_available:
+        _search_vector_available[key] = bind.dialect.name == "postgresql" and any(
+            column["name"] == "search_vec"
+            for column in inspect(bind).get_columns("products")
+        )
+    return _search_vector_available[key]
+
+def _full_text_match(search_term: str):
+    """
+    Build a tsvector match condition for PostgreSQL full-text search
+    
+    Matches whole words, unlike the ILIKE fallback: "lap" no longer finds
+    "laptop".
+    """
+    return _SEARCH_VECTOR.op("@@")(func.plainto_tsquery("simple", search_term))
+
 class QueryOptimizer:
     """Utility class for optimizing database queries"""
     
     @staticmethod
     def log_query_performance(func):
         """Decorator to log query execution time"""
+        name = func.__name__
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             if execution_time > 0.1:  # Log slow queries (>100ms)
-                logger.warning(f"Slow query detected: {func.__name__} took {execution_time:.3f}s")
-            else:
-                logger.info(f"Query {func.__name__} executed in {execution_time:.3f}s")
+                logger.warning("Slow query detected: %s took %.3fs", name, execution_time)
+            elif logger.isEnabledFor(logging.INFO):
+                logger.info("Query %s executed in %.3fs", name, execution_time)
                 
             return result
         return wrapper
@@ -40,11 +78,11 @@ class QueryOptimizer:
     @contextmanager
     def query_timer(operation_name: str):
         """Context manager for timing database operations"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             yield
         finally:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.info(f"{operation_name} completed in {execution_time:.3f}s")
 
 class OptimizedQueries:
@@ -62,11 +100,20 @@ class OptimizedQueries:
         search: Optional[str] = None,
         status: str = "available",
         sort_by: str = "created_at",
-        sort_order: str = "desc"
-    ) -> tuple[List[Product], int]:
+        sort_order: str = "desc",
+        cursor_value: Optional[Any] = None,
+        cursor_id: Optional[str] = None
+    ) -> tuple[List[Product], Optional[int], Optional[Tuple[Any, str]]]:
         """
         Optimized product search with filtering, sorting, and pagination
-        Returns (products, total_count)
+        Returns (products, total_count, next_cursor)
+
+        When cursor_value/cursor_id are given, keyset (seek) pagination is used:
+        rows after (sort_column, id) are fetched directly instead of scanning
+        and discarding `skip` rows, and the COUNT(*) is skipped (total_count
+        is None). The offset path is kept for jump-to-page navigation.
+        next_cursor is the (sort value, id) of the last row, or None on the
+        last page.
         """
         # Build base query with optimized joins
         query = db.query(Product).options(
@@ -87,26 +134,48 @@ class OptimizedQueries:
             filters.append(Product.price <= max_price)
             
         if search:
-            # Use indexed title search
-            filters.append(Product.title.ilike(f"%{search}%"))
+            if _has_search_vector(db):
+                # Use the GIN-indexed full-text search vector
+                filters.append(_full_text_match(search))
+            else:
+                # Use indexed title search
+                filters.append(Product.title.ilike(f"%{search}%"))
         
         # Apply all filters at once for better query planning
         query = query.filter(and_(*filters))
         
-        # Get total count before applying pagination
-        total_count = query.count()
+        use_cursor = cursor_value is not None and cursor_id is not None
+        
+        # Get total count before applying pagination (not needed when seeking)
+        total_count = None if use_cursor else query.count()
         
-        # Apply sorting using indexed columns
+        # Apply sorting using indexed columns; id breaks ties so the
+        # (sort_column, id) key is unique and seeking is stable
         sort_column = getattr(Product, sort_by, Product.created_at)
         if sort_order == "desc":
-            query = query.order_by(desc(sort_column))
+            query = query.order_by(desc(sort_column), desc(Product.id))
         else:
-            query = query.order_by(asc(sort_column))
+            query = query.order_by(asc(sort_column), asc(Product.id))
         
         # Apply pagination
-        products = query.offset(skip).limit(limit).all()
+        if use_cursor:
+            row_key = tuple_(sort_column, Product.id)
+            cursor_key = tuple_(cursor_value, cursor_id)
+            if sort_order == "desc":
+                query = query.filter(row_key < cursor_key)
+            else:
+                query = query.filter(row_key > cursor_key)
+        else:
+            query = query.offset(skip)
+        
+        products = query.limit(limit).all()
         
-        return products, total_count
+        next_cursor = None
+        if products and len(products) == limit:
+            last = products[-1]
+            next_cursor = (getattr(last, sort_column.key), last.id)
+        
+        return products, total_count, next_cursor
     
     @staticmethod
     @QueryOptimizer.log_query_performance
@@ -125,6 +194,24 @@ class OptimizedQueries:
             
         return query.order_by(desc(Product.created_at)).all()
     
+    @staticmethod
+    def iter_user_products(
+        db: Session,
+        user_id: str,
+        status: Optional[str] = None,
+        batch_size: int = 500
+    ) -> Iterable[Product]:
+        """
+        Stream a user's products in batches instead of loading them all
+        Peak memory stays at one batch regardless of how many products exist
+        """
+        query = db.query(Product).filter(Product.seller_id == user_id)
+        
+        if status:
+            query = query.filter(Product.status == status)
+            
+        return query.order_by(desc(Product.created_at)).yield_per(batch_size)
+    
     @staticmethod
     @QueryOptimizer.log_query_performance
     def get_categories_with_product_counts(db: Session) -> List[Dict[str, Any]]:
@@ -182,9 +269,16 @@ class OptimizedQueries:
         Full-text search across product title and description
         Uses database-specific optimizations where available
         """
-        # For SQLite, use simple LIKE queries on indexed columns
-        # In production with PostgreSQL, this could use full-text search
-        search_pattern = f"%{search_term}%"
+        if _has_search_vector(db):
+            # PostgreSQL: probe the GIN index on the generated tsvector column
+            search_filter = _full_text_match(search_term)
+        else:
+            # Elsewhere, use simple LIKE queries on indexed columns
+            search_pattern = f"%{search_term}%"
+            search_filter = or_(
+                Product.title.ilike(search_pattern),
+                Product.description.ilike(search_pattern)
+            )
         
         query = db.query(Product).options(
             joinedload(Product.category),
@@ -192,15 +286,15 @@ class OptimizedQueries:
         ).filter(
             and_(
                 Product.status == "available",
-                or_(
-                    Product.title.ilike(search_pattern),
-                    Product.description.ilike(search_pattern)
-                )
+                search_filter
             )
         )
         
         return query.order_by(desc(Product.created_at)).limit(limit).all()
 
+# Table size estimates change slowly; avoid re-reading catalogs on every check
+_table_sizes_cache = InMemoryCache(default_ttl=300)
+
 class DatabaseHealthMonitor:
     """Monitor database performance and health"""
     
@@ -215,14 +309,49 @@ class DatabaseHealthMonitor:
     
     @staticmethod
     def get_table_sizes(db: Session) -> Dict[str, int]:
-        """Get approximate table sizes"""
+        """
+        Get approximate table sizes
+        Uses planner statistics (pg_class / sqlite_stat1) instead of COUNT(*) scans
+        """
+        # Keyed per database so sessions on different engines never share sizes
+        bind = db.get_bind()
+        cache_key = f"table_sizes:{bind.url}"
+        cached_sizes = _table_sizes_cache.get(cache_key)
+        if cached_sizes is not None:
+            return cached_sizes
+        
         tables = ['users', 'products', 'categories']
         sizes = {}
+        dialect = bind.dialect.name
         
-        for table in tables:
-            count = db.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
-            sizes[table] = count
-            
+        if dialect == 'postgresql':
+            rows = db.execute(
+                text("SELECT relname, reltuples::bigint FROM pg_class WHERE relname = ANY(:tables)"),
+                {'tables': tables}
+            )
+            # reltuples is -1 for tables that were never analyzed
+            sizes = {name: count for name, count in rows if count >= 0}
+        elif dialect == 'sqlite':
+            try:
+                rows = db.execute(
+                    text("SELECT tbl, stat FROM sqlite_stat1 WHERE tbl IN :tables").bindparams(
+                        bindparam('tables', expanding=True)
+                    ),
+                    {'tables': tables}
+                )
+                # The first integer of the stat string is the table row count
+                for name, stat in rows:
+                    sizes.setdefault(name, int(stat.split()[0]))
+            except SQLAlchemyError:
+                # sqlite_stat1 only exists after ANALYZE has been run
+                pass
+        
+        # Fall back to exact counts for tables without statistics
+        for name in tables:
+            if name not in sizes:
+                sizes[name] = db.execute(select(func.count()).select_from(table(name))).scalar()
+        
+        _table_sizes_cache.set(cache_key, sizes)
         return sizes
     
     @staticmethod
@@ -2,15 +2,15 @@
 Rate limiting middleware for API endpoints
 """
 import time
-from typing import Dict, Optional, Callable, List
+from collections import defaultdict, deque
+from typing import Dict, Optional, Callable, List, Deque
 from fastapi import Request, HTTPException, status
 from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 import logging
 import redis
-from functools import wraps
+from functools import wraps, lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,22 +29,25 @@ class InMemoryRateLimiter:
     """In-memory rate limiter for single instance deployments"""
     
     def __init__(self):
-        self._requests: Dict[str, List[float]] = {}
+        self._requests: Dict[str, Deque[float]] = defaultdict(deque)
         self._cleanup_interval = 60  # Cleanup old entries every 60 seconds
-        self._last_cleanup = time.time()
+        self._last_cleanup = time.monotonic()
+    
+    @staticmethod
+    def _trim(timestamps: Deque[float], cutoff_time: float) -> None:
+        """Drop timestamps at or before the cutoff (oldest are on the left)"""
+        while timestamps and timestamps[0] <= cutoff_time:
+            timestamps.popleft()
     
     def _cleanup_old_entries(self, window_seconds: int = 3600):
         """Remove old entries to prevent memory leaks"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         if current_time - self._last_cleanup > self._cleanup_interval:
             cutoff_time = current_time - window_seconds
             
             for key in list(self._requests.keys()):
-                self._requests[key] = [
-                    timestamp for timestamp in self._requests[key]
-                    if timestamp > cutoff_time
-                ]
+                self._trim(self._requests[key], cutoff_time)
                 
                 # Remove empty entries
                 if not self._requests[key]:
@@ -54,42 +57,33 @@ class InMemoryRateLimiter:
     
     def is_allowed(self, key: str, limit: int, window_seconds: int = 60) -> bool:
         """Check if request is allowed based on rate limit"""
-        current_time = time.time()
+        current_time = time.monotonic()
         self._cleanup_old_entries(window_seconds * 2)  # Cleanup with larger window
         
-        if key not in self._requests:
-            self._requests[key] = []
-        
         # Remove old requests outside the window
-        cutoff_time = current_time - window_seconds
-        self._requests[key] = [
-            timestamp for timestamp in self._requests[key]
-            if timestamp > cutoff_time
-        ]
+        timestamps = self._requests[key]
+        self._trim(timestamps, current_time - window_seconds)
         
         # Check if under limit
-        if len(self._requests[key]) >= limit:
+        if len(timestamps) >= limit:
             return False
         
         # Add current request
-        self._requests[key].append(current_time)
+        timestamps.append(current_time)
         return True
     
     def get_remaining_requests(self, key: str, limit: int, window_seconds: int = 60) -> int:
         """Get remaining requests in current window"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         if key not in self._requests:
             return limit
         
         # Count requests in current window
-        cutoff_time = current_time - window_seconds
-        current_requests = len([
-            timestamp for timestamp in self._requests[key]
-            if timestamp > cutoff_time
-        ])
+        timestamps = self._requests[key]
+        self._trim(timestamps, current_time - window_seconds)
         
-        return max(0, limit - current_requests)
+        return max(0, limit - len(timestamps))
 
 class DistributedRateLimiter:
     """Redis-based distributed rate limiter"""
@@ -100,6 +94,7 @@ class DistributedRateLimiter:
     def is_allowed(self, key: str, limit: int, window_seconds: int = 60) -> bool:
         """Check if request is allowed using Redis sliding window"""
         try:
+            # Wall-clock time: scores are shared across processes via Redis
             current_time = time.time()
             cutoff_time = current_time - window_seconds
             
@@ -157,17 +152,19 @@ else:
 def get_client_ip(request: Request) -> str:
     """Get client IP address for rate limiting"""
     # Check for real IP behind proxy
-    forwarded_for = request.headers.get('X-Forwarded-For')
+    forwarded_for = request.headers.get('x-forwarded-for')
     if forwarded_for:
-        # Take the first IP in case of multiple proxies
-        return forwarded_for.split(',')[0].strip()
+        # Take the first IP in case of multiple proxies (no list allocation)
+        comma = forwarded_for.find(',')
+        return (forwarded_for[:comma] if comma >= 0 else forwarded_for).strip()
     
-    real_ip = request.headers.get('X-Real-IP')
+    real_ip = request.headers.get('x-real-ip')
     if real_ip:
         return real_ip
     
-    # Fallback to direct connection
-    return get_remote_address(request)
+    # Fallback to direct connection, read straight from the ASGI scope
+    client = request.scope.get('client')
+    return client[0] if client else "127.0.0.1"
 
 limiter = Limiter(key_func=get_client_ip)
 
@@ -200,6 +197,15 @@ def rate_limit(calls: int, period: int = 60, per: str = "minute"):
         return wrapper
     return decorator
 
+# Seconds per rate limit period name
+_PERIOD_MAP = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+@lru_cache(maxsize=32)
+def parse_rate_limit(limit: str) -> tuple[int, int]:
+    """Parse a limit string (e.g. "5/minute") into (calls, period_seconds)"""
+    calls, period_str = limit.split('/')
+    return int(calls), _PERIOD_MAP.get(period_str, 60)
+
 # Specific rate limiters for different endpoints
 class APIRateLimits:
     """Predefined rate limits for different API endpoints"""
@@ -255,15 +261,11 @@ class SecurityRateLimiter:
             key = f"security_limit:{endpoint}:{client_ip}"
             
             # Parse limit (e.g., "5/minute" -> 5 calls per 60 seconds)
-            calls, period_str = limit.split('/')
-            calls = int(calls)
+            calls, period_seconds = parse_rate_limit(limit)
             
             # Reduce allowed calls by 80% for suspicious requests
             security_calls = max(1, calls // 5)
             
-            period_map = {"minute": 60, "hour": 3600, "day": 86400}
-            period_seconds = period_map.get(period_str, 60)
-            
             if not rate_limiter.is_allowed(key, security_calls, period_seconds):
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
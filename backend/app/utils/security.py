@@ -4,6 +4,8 @@ Input validation and sanitization utilities for security
 import re
 import html
 import bleach
+from bleach.sanitizer import Cleaner
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, validator
 from fastapi import HTTPException, status
@@ -11,6 +13,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Precompiled helpers for text sanitization
+_NULL_TRANSLATE = str.maketrans('', '', '\x00')
+_WS_RE = re.compile(r'\s+')
+
 class SecurityConfig:
     """Security configuration settings"""
     
@@ -47,6 +53,27 @@ class SecurityConfig:
         r"onclick=",
     ]
 
+# Every pattern except the SQL keyword one needs at least one of these
+# characters, so text without them only has to be checked for keywords
+_DANGER_TABLE = str.maketrans('', '', "'\"<>;-/*=&:")
+_SQL_KEYWORD_RE = re.compile(SecurityConfig.SQL_INJECTION_PATTERNS[0], re.IGNORECASE)
+
+# Reusable HTML cleaners; building a Cleaner parses its configuration
+_DEFAULT_CLEANER = Cleaner(
+    tags=SecurityConfig.ALLOWED_HTML_TAGS,
+    attributes=SecurityConfig.ALLOWED_HTML_ATTRIBUTES,
+    strip=True
+)
+
+@lru_cache(maxsize=16)
+def _get_cleaner(tags: tuple) -> Cleaner:
+    """Get a cached Cleaner for a custom set of allowed tags"""
+    return Cleaner(
+        tags=list(tags),
+        attributes=SecurityConfig.ALLOWED_HTML_ATTRIBUTES,
+        strip=True
+    )
+
 class InputSanitizer:
     """Utility class for sanitizing user inputs"""
     
@@ -58,17 +85,11 @@ class InputSanitizer:
         if not text:
             return text
             
-        allowed_tags = allowed_tags or SecurityConfig.ALLOWED_HTML_TAGS
-        
         # Use bleach to clean HTML
-        cleaned = bleach.clean(
-            text,
-            tags=allowed_tags,
-            attributes=SecurityConfig.ALLOWED_HTML_ATTRIBUTES,
-            strip=True
-        )
+        if not allowed_tags or allowed_tags == SecurityConfig.ALLOWED_HTML_TAGS:
+            return _DEFAULT_CLEANER.clean(text)
         
-        return cleaned
+        return _get_cleaner(tuple(allowed_tags)).clean(text)
     
     @staticmethod
     def sanitize_text(text: str, max_length: Optional[int] = None) -> str:
@@ -78,18 +99,15 @@ class InputSanitizer:
         if not text:
             return text
             
-        # Remove null bytes
-        text = text.replace('\x00', '')
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Remove null bytes and normalize whitespace
+        text = _WS_RE.sub(' ', text.translate(_NULL_TRANSLATE)).strip()
         
         # Escape HTML entities
         text = html.escape(text)
         
         # Truncate if needed
         if max_length and len(text) > max_length:
-            text = text[:max_length].strip()
+            text = text[:max_length].rstrip()
             
         return text
     
@@ -174,6 +192,19 @@ class SecurityValidator:
         """
         Comprehensive security validation for text input
         """
+        if not text:
+            return
+        
+        # Fast path for benign text: skip the full pattern scans
+        if len(text.translate(_DANGER_TABLE)) == len(text):
+            if _SQL_KEYWORD_RE.search(text):
+                logger.warning(f"Potential SQL injection detected: {_SQL_KEYWORD_RE.pattern}")
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid characters detected in {field_name}"
+                )
+            return
+        
         if SecurityValidator.detect_sql_injection(text):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
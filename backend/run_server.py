@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 """
 Launch the Student Marketplace API server
+
+Set DEV=1 for auto-reload and debug logging.
 """
+import importlib.util
+import os
 import uvicorn
 import logging
 
+DEV = bool(os.getenv("DEV"))
+
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=logging.DEBUG if DEV else logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _has_module(name: str) -> bool:
+    """Check whether an optional module is installed"""
+    return importlib.util.find_spec(name) is not None
+
 def start_server():
     """Start the FastAPI server"""
     try:
@@ -18,13 +28,21 @@ def start_server():
         from app.main import app
         logger.info("✅ FastAPI app loaded successfully")
         
-        # Start the server
+        # Use the C event loop and HTTP parser when available (uvloop is not
+        # supported on Windows)
+        loop = "uvloop" if _has_module("uvloop") else "asyncio"
+        http = "httptools" if _has_module("httptools") else "h11"
+        
+        # Start the server; the reloader only runs a single worker
         uvicorn.run(
             "app.main:app",
             host="127.0.0.1",
             port=8000,
-            reload=True,
-            log_level="debug"
+            reload=DEV,
+            workers=None if DEV else int(os.getenv("WORKERS", os.cpu_count() or 1)),
+            loop=loop,
+            http=http,
+            log_level="debug" if DEV else "info"
         )
         
     except Exception as e:
@@ -33,4 +51,4 @@ def start_server():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    start_server()
@@ -2,17 +2,23 @@
 """
 Test authentication endpoints
 """
-import requests
 import json
 import sys
 
 BASE_URL = "http://127.0.0.1:8000"
 
 def test_api():
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    # Reuse one pooled connection for all requests
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0))
+    
     try:
         # Test root endpoint
         print("🧪 Testing root endpoint...")
-        response = requests.get(f"{BASE_URL}/")
+        response = session.get(f"{BASE_URL}/")
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.json()}")
         print()
@@ -24,7 +30,7 @@ def test_api():
             "email": "test@example.com",
             "password": "testpassword123"
         }
-        response = requests.post(f"{BASE_URL}/auth/register", json=user_data)
+        response = session.post(f"{BASE_URL}/auth/register", json=user_data)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.json()}")
         print()
@@ -35,7 +41,7 @@ def test_api():
             "username": "testuser",
             "password": "testpassword123"
         }
-        response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
+        response = session.post(f"{BASE_URL}/auth/login", json=login_data)
         print(f"Status Code: {response.status_code}")
         login_response = response.json()
         print(f"Response: {login_response}")
@@ -48,7 +54,7 @@ def test_api():
                 # Test protected endpoint
                 print("🧪 Testing protected endpoint...")
                 headers = {"Authorization": f"Bearer {token}"}
-                response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
+                response = session.get(f"{BASE_URL}/auth/me", headers=headers)
                 print(f"Status Code: {response.status_code}")
                 print(f"Response: {response.json()}")
                 
@@ -58,6 +64,8 @@ def test_api():
         print("❌ Could not connect to the server. Make sure it's running on http://127.0.0.1:8000")
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        session.close()
 
 if __name__ == "__main__":
     test_api()
\ No newline at end of file
@@ -2,19 +2,56 @@
 Test script to verify Task 8 implementation
 """
 import asyncio
+import os
 import tempfile
+from collections import defaultdict
 from pathlib import Path
-try:
+
+def _fit(src_size, max_size):
+    """Scale src_size to fit within max_size, preserving aspect ratio like thumbnail()"""
+    ratio = min(max_size[0] / src_size[0], max_size[1] / src_size[1])
+    return (int(src_size[0] * ratio), int(src_size[1] * ratio))
+
+def _resize_to_fit(img, max_size):
+    """Resize into a single new buffer, or return the source if it already fits"""
     from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+    
+    if img.size[0] <= max_size[0] and img.size[1] <= max_size[1]:
+        return img
+    return img.resize(_fit(img.size, max_size), Image.Resampling.LANCZOS)
+
+def _existing(paths):
+    """Return the subset of paths that exist, reading each parent directory once"""
+    by_parent = defaultdict(list)
+    for path in paths:
+        by_parent[path.parent].append(path)
+    
+    existing = set()
+    for parent, children in by_parent.items():
+        if len(children) == 1:
+            # A single lstat is cheaper than listing the whole directory;
+            # lexists does not follow symlinks, matching the scandir check
+            if os.path.lexists(children[0]):
+                existing.add(children[0])
+            continue
+        
+        try:
+            with os.scandir(parent) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            # Missing parent directory: none of its children exist
+            continue
+        existing.update(child for child in children if child.name in names)
+    return existing
 
 async def test_image_upload():
     """Test the image upload functionality"""
     print("Testing image upload functionality...")
     
-    if not PIL_AVAILABLE:
+    # Imported here so collecting this module does not load Pillow
+    try:
+        from PIL import Image
+    except ImportError:
         print("⚠️  PIL/Pillow not available - image processing tests skipped")
         return True
     
@@ -37,16 +74,13 @@ async def test_image_upload():
         # Test image processing capabilities
         with Image.open(temp_path) as img:
             # Test thumbnail generation
-            thumbnail = img.copy()
-            thumbnail.thumbnail((150, 150), Image.Resampling.LANCZOS)
+            thumbnail = _resize_to_fit(img, (150, 150))
             
             # Test medium size
-            medium = img.copy()
-            medium.thumbnail((400, 400), Image.Resampling.LANCZOS)
+            medium = _resize_to_fit(img, (400, 400))
             
             # Test large size
-            large = img.copy()
-            large.thumbnail((800, 600), Image.Resampling.LANCZOS)
+            large = _resize_to_fit(img, (800, 600))
             
             print("✅ Image processing capabilities verified")
             print(f"   Original: {img.size}")
@@ -76,8 +110,9 @@ def test_search_and_filtering():
             Path("../src/hooks/use-debounce.ts"),
         ]
         
+        existing = _existing(components)
         for component in components:
-            if component.exists():
+            if component in existing:
                 print(f"✅ Component exists: {component.name}")
             else:
                 print(f"❌ Component missing: {component.name}")
@@ -100,8 +135,9 @@ def test_pagination():
             Path("../src/components/ui/pagination.tsx"),
         ]
         
+        existing = _existing(components)
         for component in components:
-            if component.exists():
+            if component in existing:
                 print(f"✅ Component exists: {component.name}")
             else:
                 print(f"❌ Component missing: {component.name}")
@@ -124,16 +160,18 @@ def test_database_schema():
             Path("alembic/versions/b37860466cab_add_images_column_to_products.py"),
         ]
         
+        db_file = Path("student_marketplace.db")
+        existing = _existing(migrations + [db_file])
+        
         for migration in migrations:
-            if migration.exists():
+            if migration in existing:
                 print(f"✅ Migration exists: {migration.name}")
             else:
                 print(f"❌ Migration missing: {migration.name}")
                 return False
         
         # Check database file exists
-        db_file = Path("student_marketplace.db")
-        if db_file.exists():
+        if db_file in existing:
             print(f"✅ Database file exists: {db_file}")
         else:
             print(f"❌ Database file missing: {db_file}")
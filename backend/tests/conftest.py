@@ -0,0 +1,145 @@
+"""
+Shared pytest fixtures for the backend test suite
+"""
+import os
+
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+from app.schemas.user import UserCreate
+from app.utils import auth as auth_utils
+
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+# pysqlite manages transactions itself and breaks SAVEPOINT; let SQLAlchemy
+# emit BEGIN so each test can run inside one rolled-back transaction
+def _configure_sqlite(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+def _test_session(connection):
+    """Session joined to the test's transaction; commits release a SAVEPOINT"""
+    return TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_up():
+    """
+    Pay one-time lazy setup costs before the first test runs
+
+    Signs and verifies a JWT and validates a UserCreate (email validation is
+    imported on first use), so the first timed test doesn't absorb them.
+    Password hashing is left out: real bcrypt has no place in a fixture every
+    test depends on.
+    """
+    auth_utils.get_user_id_from_token(auth_utils.create_access_token({"sub": "warm-up"}))
+    UserCreate(username="warmup", email="warmup@example.com", password="warm-up-password")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fast_password_hashing(request):
+    """
+    Replace bcrypt with a plaintext password context while TESTING=1
+
+    bcrypt's cost factor is tuned for production, so every register/login
+    in a test pays for it. Applies per module, before the module's own
+    fixtures run; modules that check the hashing itself opt out with
+    ``pytestmark = pytest.mark.real_password_hashing``.
+    """
+    if os.environ.get("TESTING") != "1" or request.node.get_closest_marker("real_password_hashing"):
+        yield
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth_utils, "pwd_context", CryptContext(schemes=["plaintext"]))
+        yield
+
+
+@pytest.fixture(scope="module")
+def database_url(request):
+    """
+    URL of the module's test database
+
+    A shared-cache in-memory database, so no test touches the disk. The
+    name carries the module and the pytest-xdist worker id, so neither
+    modules nor parallel workers ever share a DB.
+    """
+    module = request.module.__name__.rpartition(".")[2]
+    return f"sqlite+pysqlite:///file:{module}_{XDIST_WORKER}?mode=memory&cache=shared&uri=true"
+
+
+@pytest.fixture(scope="module")
+def engine(database_url):
+    """
+    Test engine for the module's database
+
+    StaticPool keeps the fixtures and the app on the same connection.
+    """
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    event.listen(engine, "connect", _configure_sqlite)
+    event.listen(engine, "begin", _emit_begin)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def database_schema(engine):
+    """Create the tables once per module"""
+    # The in-memory database starts empty, so skip the per-table existence checks
+    Base.metadata.create_all(bind=engine, checkfirst=False)
+    yield
+    Base.metadata.drop_all(bind=engine, checkfirst=False)
+
+
+@pytest.fixture
+def test_db(engine, database_schema):
+    """Run each test inside a transaction that is rolled back afterwards"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def db_session(test_db):
+    """Session on the test's transaction, for fixtures seeding data"""
+    db = _test_session(test_db)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def override_get_db(test_db):
+    """Give each request its own session on the test's transaction"""
+    def get_test_db():
+        db = _test_session(test_db)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(get_db, None)
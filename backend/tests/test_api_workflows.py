@@ -4,101 +4,341 @@ API Workflow Tests
 Tests for specific API workflows and edge cases that complement the integration tests.
 """
 
+import hashlib
+import os
+import shutil
+import sqlite3
 import pytest
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
 import tempfile
 import json
 from datetime import datetime, timedelta
+from types import MappingProxyType
 
 from app.main import app
 from app.database import Base, get_db
+from app.dependencies import get_current_user, security
 from app.models.user import User
 from app.models.product import Product
 from app.models.category import Category
+from app.utils.auth import get_password_hash, create_access_token
 
 
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_workflows.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _memory_pragmas(dbapi_connection, connection_record):
+    """Keep the journal and temp tables in memory too if a file DB is used"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
-def override_get_db():
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+TEST_USER = {
+    "username": "testuser",
+    "email": "test@example.com",
+    "password": "testpassword123"
+}
+
+# Search workflow products as (category name, product) pairs; the category id
+# is only known at runtime
+_SEARCH_PRODUCTS = (
+    ("Electronics", MappingProxyType({"title": "MacBook Pro 16", "description": "Apple laptop computer", "price": 2499.99})),
+    ("Electronics", MappingProxyType({"title": "Dell XPS 13", "description": "Windows laptop", "price": 1299.99})),
+    ("Electronics", MappingProxyType({"title": "iPhone 14", "description": "Apple smartphone", "price": 999.99})),
+    ("Books", MappingProxyType({"title": "Python Programming", "description": "Learn Python programming", "price": 49.99})),
+    ("Books", MappingProxyType({"title": "Data Structures", "description": "Computer science textbook", "price": 89.99})),
+    ("Books", MappingProxyType({"title": "Calculus Textbook", "description": "Mathematics textbook", "price": 159.99})),
+)
+
+# Boundary-length strings for the title (200) and description (2000) limits
+_X200 = "x" * 200
+_X201 = _X200 + "x"
+_X2000 = "x" * 2000
+_X2001 = _X2000 + "x"
+
+# Seed titles/descriptions for bulk-inserted products, formatted once
+_TITLES = tuple(f"Product {i:02d}" for i in range(64))
+_DESCS = tuple(f"Description for product {i}" for i in range(64))
+
+# Placeholder replaced with the module's test category id
+_TEST_CATEGORY = "<test-category>"
+
+_INVALID_PRODUCTS = (
+    # Empty title
+    MappingProxyType({"title": "", "price": 100.0, "category_id": _TEST_CATEGORY}),
+    # Negative price
+    MappingProxyType({"title": "Valid Title", "price": -10.0, "category_id": _TEST_CATEGORY}),
+    # Zero price
+    MappingProxyType({"title": "Valid Title", "price": 0.0, "category_id": _TEST_CATEGORY}),
+    # Missing category
+    MappingProxyType({"title": "Valid Title", "price": 100.0, "category_id": ""}),
+    # Invalid category ID
+    MappingProxyType({"title": "Valid Title", "price": 100.0, "category_id": "nonexistent"}),
+    # Title too long (over 200 chars)
+    MappingProxyType({"title": _X201, "price": 100.0, "category_id": _TEST_CATEGORY}),
+    # Description too long (over 2000 chars)
+    MappingProxyType({"title": "Valid", "description": _X2001, "price": 100.0, "category_id": _TEST_CATEGORY}),
+)
+
+_INVALID_PRODUCT_IDS = (
+    "empty-title",
+    "negative-price",
+    "zero-price",
+    "missing-category",
+    "invalid-category",
+    "title-too-long",
+    "description-too-long",
+)
+
+_VALID_PRODUCTS = (
+    # Minimum valid title length
+    MappingProxyType({"title": "abc", "price": 0.01, "category_id": _TEST_CATEGORY}),
+    # Maximum valid title length
+    MappingProxyType({"title": _X200, "price": 999999.99, "category_id": _TEST_CATEGORY}),
+    # Maximum valid description length
+    MappingProxyType({"title": "Valid", "description": _X2000, "price": 100.0, "category_id": _TEST_CATEGORY}),
+)
+
+_VALID_PRODUCT_IDS = ("min-title", "max-title", "max-description")
+
+
+def _with_category(product, category_id):
+    """Copy a product template, filling in the test category placeholder"""
+    if product["category_id"] == _TEST_CATEGORY:
+        return dict(product) | {"category_id": category_id}
+    return dict(product)
+
+
+def _schema_template_path(engine):
+    """Path of the cached schema DB, keyed on the DDL so model changes rebuild it"""
+    dialect = engine.dialect
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes)
+    digest = hashlib.sha1("\n".join(ddl).encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"test_workflows_schema_{digest}.sqlite")
+
+
+def _sqlite_connection(engine):
+    """The sqlite3 connection behind the engine's single pooled connection"""
+    raw = engine.raw_connection()
+    try:
+        return raw.driver_connection
+    finally:
+        raw.close()
+
+
+@pytest.fixture(scope="module")
+def database_url(database_url):
+    """
+    URL of the test database
+    
+    Set TEST_DB_FILE=1 to use a real SQLite file instead of the shared
+    in-memory database. The file goes in a private directory on /dev/shm
+    when available, keeping file semantics without disk I/O, and is
+    removed at the end of the module.
+    """
+    if os.environ.get("TEST_DB_FILE") != "1":
+        yield database_url
+        return
+    
+    db_dir = tempfile.mkdtemp(
+        prefix="test_workflows_",
+        dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+    )
     try:
-        db = TestingSessionLocal()
-        yield db
+        yield f"sqlite:///{db_dir}/test_workflows.db"
     finally:
-        db.close()
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def engine(engine):
+    """The shared test engine, with the in-memory journal PRAGMAs"""
+    event.listen(engine, "connect", _memory_pragmas)
+    return engine
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database_schema(engine):
+    """
+    Load the schema once for the module
+    
+    The schema is copied from a template database with the SQLite backup
+    API. The template is built with create_all the first time and then
+    shared by later runs and xdist workers.
+    """
+    template = _schema_template_path(engine)
+    target = _sqlite_connection(engine)
+    
+    if os.path.exists(template):
+        source = sqlite3.connect(template)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+    else:
+        Base.metadata.create_all(bind=engine)
+        # Write to a private file first so concurrent workers never read a
+        # half-written template
+        partial = f"{template}.{os.getpid()}"
+        destination = sqlite3.connect(partial)
+        try:
+            target.backup(destination)
+        finally:
+            destination.close()
+        os.replace(partial, template)
+    
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="session")
+def _client_ctx():
+    """Run the app lifespan once and share the TestClient across tests"""
+    with TestClient(app) as c:
+        yield c
+
+
+def _current_user_override(token, user_id):
+    """
+    get_current_user that trusts the module's own token without decoding it
+
+    Any other token (e.g. users registered inside a test) still goes through
+    the real JWT verification.
+    """
+    async def current_user(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        db=Depends(get_db)
+    ):
+        if credentials.credentials == token:
+            return db.get(User, user_id)
+        return await get_current_user(credentials, db)
+    
+    return current_user
 
-app.dependency_overrides[get_db] = override_get_db
+
+def _seed_products(db, n, category_id, seller_id):
+    """Insert n (at most 64) products in one executemany, bypassing the POST endpoint"""
+    db.bulk_insert_mappings(Product, [
+        {
+            "title": _TITLES[i],
+            "description": _DESCS[i],
+            "price": 10.0 + (i * 5.0),
+            "category_id": category_id,
+            "seller_id": seller_id,
+            "status": "available"
+        }
+        for i in range(n)
+    ])
+    db.commit()
 
 
 class TestAPIWorkflows:
     """Test specific API workflows and business logic"""
     
     @pytest.fixture(scope="function")
-    def client(self):
-        """Create test client with fresh database"""
-        Base.metadata.create_all(bind=engine)
-        with TestClient(app) as c:
-            yield c
-        Base.metadata.drop_all(bind=engine)
+    def client(self, _client_ctx, override_get_db):
+        """Test client whose database changes are rolled back afterwards"""
+        return _client_ctx
     
-    @pytest.fixture
-    def authenticated_user(self, client):
-        """Create and authenticate a test user"""
-        user_data = {
-            "username": "testuser",
-            "email": "test@example.com", 
-            "password": "testpassword123"
-        }
-        
-        # Register user
-        client.post("/auth/register", json=user_data)
-        
-        # Login and get token
-        login_response = client.post("/auth/login", json={
-            "username": user_data["username"],
-            "password": user_data["password"]
-        })
-        
-        token = login_response.json()["access_token"]
-        user_info = login_response.json()["user"]
-        
-        return {
+    @pytest.fixture(scope="module")
+    def authenticated_user(self, _client_ctx, engine):
+        """
+        Seed a test user once per module and mint its token in-process
+        
+        The password is hashed here rather than at import, so it goes
+        through the module's fast hasher.
+        """
+        db = TestingSessionLocal(bind=engine)
+        try:
+            user = User(
+                username=TEST_USER["username"],
+                email=TEST_USER["email"],
+                password_hash=get_password_hash(TEST_USER["password"])
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+            user_info = {"id": user.id, "username": user.username, "email": user.email}
+        finally:
+            db.close()
+        
+        token = create_access_token(data={"sub": user_info["id"]})
+        headers = MappingProxyType({"Authorization": f"Bearer {token}"})
+        
+        # Skip the JWT signature check for this module's token
+        app.dependency_overrides[get_current_user] = _current_user_override(token, user_info["id"])
+        
+        def post_product(data):
+            return _client_ctx.post("/products/", json=data, headers=headers)
+        
+        def post_category(data):
+            return _client_ctx.post("/categories/", json=data, headers=headers)
+        
+        def post_products(products):
+            """POST several products in order and return the responses"""
+            return [post_product(data) for data in products]
+        
+        yield {
             "token": token,
-            "headers": {"Authorization": f"Bearer {token}"},
-            "user": user_info
+            "headers": headers,
+            "user": user_info,
+            "post_product": post_product,
+            "post_products": post_products,
+            "post_category": post_category
         }
+        
+        app.dependency_overrides.pop(get_current_user, None)
+        db = TestingSessionLocal(bind=engine)
+        try:
+            db.query(User).filter(User.id == user_info["id"]).delete()
+            db.commit()
+        finally:
+            db.close()
     
-    @pytest.fixture
-    def test_category(self, client, authenticated_user):
-        """Create a test category"""
-        category_data = {
-            "name": "Test Category",
-            "description": "Test category for workflows"
-        }
+    @pytest.fixture(scope="module")
+    def test_category(self, engine):
+        """Seed a test category once per module"""
+        db = TestingSessionLocal(bind=engine)
+        try:
+            category = Category(
+                name="Test Category",
+                description="Test category for workflows"
+            )
+            db.add(category)
+            db.commit()
+            db.refresh(category)
+            category_info = {
+                "id": category.id,
+                "name": category.name,
+                "description": category.description
+            }
+        finally:
+            db.close()
         
-        response = client.post("/categories/", json=category_data, headers=authenticated_user["headers"])
-        return response.json()
+        yield category_info
+        
+        db = TestingSessionLocal(bind=engine)
+        try:
+            db.query(Category).filter(Category.id == category_info["id"]).delete()
+            db.commit()
+        finally:
+            db.close()
 
-    def test_marketplace_pagination_workflow(self, client, authenticated_user, test_category):
+    def test_marketplace_pagination_workflow(self, client, db_session, authenticated_user, test_category):
         """Test marketplace pagination with large dataset"""
         
-        # Create 25 test products
-        products = []
-        for i in range(25):
-            product_data = {
-                "title": f"Product {i:02d}",
-                "description": f"Description for product {i}",
-                "price": 10.0 + (i * 5.0),
-                "category_id": test_category["id"]
-            }
-            
-            response = client.post("/products/", json=product_data, headers=authenticated_user["headers"])
-            assert response.status_code == 201
-            products.append(response.json())
+        # Create 25 test products directly; the create endpoint is covered
+        # by the other workflows
+        _seed_products(db_session, 25, test_category["id"], authenticated_user["user"]["id"])
         
         # Test first page (default page size should be 12)
         response = client.get("/products/")
@@ -137,30 +377,54 @@ class TestAPIWorkflows:
         assert len(filtered_page_data["products"]) == 10
         assert filtered_page_data["page"] == 2
 
+    def test_marketplace_keyset_pagination_workflow(self, client, db_session, authenticated_user, test_category):
+        """Test that following next_cursor walks the same pages as OFFSET paging"""
+        _seed_products(db_session, 25, test_category["id"], authenticated_user["user"]["id"])
+        
+        # Keyset pagination: the cursor after page 1 must yield the same
+        # products as OFFSET page 2
+        response = client.get("/products/?per_page=12")
+        assert response.status_code == 200
+        first_page = response.json()
+        last_id = first_page["products"][-1]["id"]
+        assert first_page["next_cursor"] == last_id
+        
+        response = client.get(f"/products/?after_id={last_id}&per_page=12")
+        assert response.status_code == 200
+        cursor_page = response.json()
+        assert cursor_page["total"] is None  # COUNT is skipped on the cursor path
+        
+        offset_page = client.get("/products/?page=2&per_page=12").json()
+        assert [p["id"] for p in cursor_page["products"]] == [p["id"] for p in offset_page["products"]]
+        
+        # Following the cursor to the end returns the single remaining product
+        response = client.get(f"/products/?after_id={cursor_page['next_cursor']}&per_page=12")
+        assert response.status_code == 200
+        last_cursor_page = response.json()
+        assert len(last_cursor_page["products"]) == 1
+        assert last_cursor_page["next_cursor"] is None
+    
     def test_advanced_search_workflow(self, client, authenticated_user):
         """Test advanced search functionality with multiple criteria"""
         
         # Create categories
-        electronics = client.post("/categories/", json={
+        electronics_id = authenticated_user["post_category"]({
             "name": "Electronics", "description": "Electronic devices"
-        }, headers=authenticated_user["headers"]).json()
+        }).json()["id"]
         
-        books = client.post("/categories/", json={
+        books_id = authenticated_user["post_category"]({
             "name": "Books", "description": "Textbooks and novels"  
-        }, headers=authenticated_user["headers"]).json()
+        }).json()["id"]
         
         # Create diverse products
+        category_ids = {"Electronics": electronics_id, "Books": books_id}
         products_data = [
-            {"title": "MacBook Pro 16", "description": "Apple laptop computer", "price": 2499.99, "category_id": electronics["id"]},
-            {"title": "Dell XPS 13", "description": "Windows laptop", "price": 1299.99, "category_id": electronics["id"]},
-            {"title": "iPhone 14", "description": "Apple smartphone", "price": 999.99, "category_id": electronics["id"]},
-            {"title": "Python Programming", "description": "Learn Python programming", "price": 49.99, "category_id": books["id"]},
-            {"title": "Data Structures", "description": "Computer science textbook", "price": 89.99, "category_id": books["id"]},
-            {"title": "Calculus Textbook", "description": "Mathematics textbook", "price": 159.99, "category_id": books["id"]},
+            dict(product) | {"category_id": category_ids[category]}
+            for category, product in _SEARCH_PRODUCTS
         ]
         
-        for product_data in products_data:
-            client.post("/products/", json=product_data, headers=authenticated_user["headers"])
+        for response in authenticated_user["post_products"](products_data):
+            assert response.status_code == 201
         
         # Test search by title keyword
         response = client.get("/products/?search=laptop")
@@ -184,7 +448,7 @@ class TestAPIWorkflows:
         assert len(results["products"]) == 2  # Data Structures and Calculus textbooks
         
         # Test search with category filter
-        response = client.get(f"/products/?search=textbook&category_id={books['id']}")
+        response = client.get(f"/products/?search=textbook&category_id={books_id}")
         results = response.json()
         assert len(results["products"]) == 2
         
@@ -211,13 +475,12 @@ class TestAPIWorkflows:
             "status": "available"
         }
         
-        response = client.post("/products/", json=product_data, headers=authenticated_user["headers"])
+        response = authenticated_user["post_product"](product_data)
         product = response.json()
         product_id = product["id"]
         
-        # Verify initial status
-        response = client.get(f"/products/{product_id}")
-        assert response.json()["status"] == "available"
+        # Verify initial status from the create response
+        assert product["status"] == "available"
         
         # Change status to pending
         response = client.put(f"/products/{product_id}", json={"status": "pending"}, headers=authenticated_user["headers"])
@@ -292,45 +555,42 @@ class TestAPIWorkflows:
         """Test category-specific product listings"""
         
         # Create multiple categories
-        electronics = client.post("/categories/", json={
+        electronics_id = authenticated_user["post_category"]({
             "name": "Electronics", "description": "Electronic devices"
-        }, headers=authenticated_user["headers"]).json()
+        }).json()["id"]
         
-        furniture = client.post("/categories/", json={
+        furniture_id = authenticated_user["post_category"]({
             "name": "Furniture", "description": "Home furniture"
-        }, headers=authenticated_user["headers"]).json()
+        }).json()["id"]
         
         # Create products in different categories
         electronics_products = [
-            {"title": "Laptop", "price": 999.99, "category_id": electronics["id"]},
-            {"title": "Phone", "price": 599.99, "category_id": electronics["id"]},
-            {"title": "Tablet", "price": 399.99, "category_id": electronics["id"]},
+            {"title": "Laptop", "price": 999.99, "category_id": electronics_id},
+            {"title": "Phone", "price": 599.99, "category_id": electronics_id},
+            {"title": "Tablet", "price": 399.99, "category_id": electronics_id},
         ]
         
         furniture_products = [
-            {"title": "Desk Chair", "price": 199.99, "category_id": furniture["id"]},
-            {"title": "Standing Desk", "price": 299.99, "category_id": furniture["id"]},
+            {"title": "Desk Chair", "price": 199.99, "category_id": furniture_id},
+            {"title": "Standing Desk", "price": 299.99, "category_id": furniture_id},
         ]
         
-        for product_data in electronics_products:
-            client.post("/products/", json=product_data, headers=authenticated_user["headers"])
-        
-        for product_data in furniture_products:
-            client.post("/products/", json=product_data, headers=authenticated_user["headers"])
+        for response in authenticated_user["post_products"](electronics_products + furniture_products):
+            assert response.status_code == 201
         
         # Test category-specific listing
-        response = client.get(f"/categories/{electronics['id']}/products")
+        response = client.get(f"/categories/{electronics_id}/products")
         assert response.status_code == 200
         electronics_results = response.json()
         assert len(electronics_results["products"]) == 3
         
-        response = client.get(f"/categories/{furniture['id']}/products")
+        response = client.get(f"/categories/{furniture_id}/products")
         assert response.status_code == 200
         furniture_results = response.json()
         assert len(furniture_results["products"]) == 2
         
         # Test category listing with pagination
-        response = client.get(f"/categories/{electronics['id']}/products?per_page=2")
+        response = client.get(f"/categories/{electronics_id}/products?per_page=2")
         assert response.status_code == 200
         paginated_results = response.json()
         assert len(paginated_results["products"]) == 2
@@ -338,7 +598,7 @@ class TestAPIWorkflows:
         assert paginated_results["total_pages"] == 2
         
         # Test category listing with price filter
-        response = client.get(f"/categories/{electronics['id']}/products?min_price=500")
+        response = client.get(f"/categories/{electronics_id}/products?min_price=500")
         assert response.status_code == 200
         filtered_results = response.json()
         assert len(filtered_results["products"]) == 2  # Laptop and Phone
@@ -379,17 +639,17 @@ class TestAPIWorkflows:
         category_id = category_response.json()["id"]
         
         # Both users create products in the same category
-        user0_product = client.post("/products/", json={
+        user0_product_id = client.post("/products/", json={
             "title": "User 0 Product",
             "price": 100.0,
             "category_id": category_id
-        }, headers=users[0]["headers"]).json()
+        }, headers=users[0]["headers"]).json()["id"]
         
-        user1_product = client.post("/products/", json={
+        user1_product_id = client.post("/products/", json={
             "title": "User 1 Product", 
             "price": 200.0,
             "category_id": category_id
-        }, headers=users[1]["headers"]).json()
+        }, headers=users[1]["headers"]).json()["id"]
         
         # Both products should appear in category listing
         response = client.get(f"/categories/{category_id}/products")
@@ -398,62 +658,38 @@ class TestAPIWorkflows:
         assert len(category_products["products"]) == 2
         
         # User 0 should not be able to edit User 1's product
-        response = client.put(f"/products/{user1_product['id']}", json={
+        response = client.put(f"/products/{user1_product_id}", json={
             "title": "Hijacked Product"
         }, headers=users[0]["headers"])
         assert response.status_code == 403
         
         # User 1 should not be able to delete User 0's product
-        response = client.delete(f"/products/{user0_product['id']}", headers=users[1]["headers"])
+        response = client.delete(f"/products/{user0_product_id}", headers=users[1]["headers"])
         assert response.status_code == 403
         
         # Each user can manage their own products
-        response = client.put(f"/products/{user0_product['id']}", json={
+        response = client.put(f"/products/{user0_product_id}", json={
             "title": "Updated by Owner"
         }, headers=users[0]["headers"])
         assert response.status_code == 200
         
-        response = client.delete(f"/products/{user1_product['id']}", headers=users[1]["headers"])
+        response = client.delete(f"/products/{user1_product_id}", headers=users[1]["headers"])
         assert response.status_code == 200
 
-    def test_data_validation_workflow(self, client, authenticated_user, test_category):
-        """Test comprehensive data validation scenarios"""
-        
-        # Test product creation with various invalid inputs
-        invalid_products = [
-            # Empty title
-            {"title": "", "price": 100.0, "category_id": test_category["id"]},
-            # Negative price
-            {"title": "Valid Title", "price": -10.0, "category_id": test_category["id"]},
-            # Zero price
-            {"title": "Valid Title", "price": 0.0, "category_id": test_category["id"]},
-            # Missing category
-            {"title": "Valid Title", "price": 100.0, "category_id": ""},
-            # Invalid category ID
-            {"title": "Valid Title", "price": 100.0, "category_id": "nonexistent"},
-            # Title too long (over 200 chars)
-            {"title": "x" * 201, "price": 100.0, "category_id": test_category["id"]},
-            # Description too long (over 2000 chars) 
-            {"title": "Valid", "description": "x" * 2001, "price": 100.0, "category_id": test_category["id"]},
-        ]
-        
-        for invalid_product in invalid_products:
-            response = client.post("/products/", json=invalid_product, headers=authenticated_user["headers"])
+    @pytest.mark.parametrize("template", _INVALID_PRODUCTS, ids=_INVALID_PRODUCT_IDS)
+    def test_invalid_product_rejected(self, client, authenticated_user, test_category, template):
+        """Test product creation with various invalid inputs"""
+        invalid_product = _with_category(template, test_category["id"])
+        # Only the status matters; streaming leaves the error body unread
+        with client.stream("POST", "/products/", json=invalid_product, headers=authenticated_user["headers"]) as response:
             assert response.status_code in [400, 404, 422], f"Failed for product: {invalid_product}"
-        
-        # Test valid edge cases
-        valid_products = [
-            # Minimum valid title length
-            {"title": "abc", "price": 0.01, "category_id": test_category["id"]},
-            # Maximum valid title length
-            {"title": "x" * 200, "price": 999999.99, "category_id": test_category["id"]},
-            # Maximum valid description length
-            {"title": "Valid", "description": "x" * 2000, "price": 100.0, "category_id": test_category["id"]},
-        ]
-        
-        for valid_product in valid_products:
-            response = client.post("/products/", json=valid_product, headers=authenticated_user["headers"])
-            assert response.status_code == 201, f"Failed for product: {valid_product}"
+    
+    @pytest.mark.parametrize("template", _VALID_PRODUCTS, ids=_VALID_PRODUCT_IDS)
+    def test_valid_product_edge_cases(self, client, authenticated_user, test_category, template):
+        """Test valid edge cases for product creation"""
+        valid_product = _with_category(template, test_category["id"])
+        response = authenticated_user["post_product"](valid_product)
+        assert response.status_code == 201, f"Failed for product: {valid_product}"
 
 
 if __name__ == "__main__":
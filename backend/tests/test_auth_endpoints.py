@@ -1,50 +1,43 @@
 """
 Integration tests for authentication endpoints
 """
+import itertools
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import get_db, Base
 from app.models.user import User
+from app.utils.auth import create_access_token, get_password_hash
 
+# Every request gets its own session on the test's rolled-back transaction
+pytestmark = pytest.mark.usefixtures("override_get_db")
 
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
-def override_get_db():
-    """Override database dependency for testing"""
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
 
+# Committed once per module for tests that only read it
+MODULE_USER = {
+    "username": "moduleuser",
+    "email": "module@example.com",
+    "password": "modulepassword123"
+}
 
-app.dependency_overrides[get_db] = override_get_db
 
-# Create test client
-client = TestClient(app)
+@pytest.fixture(scope="module")
+def client():
+    """One test client per module, so app startup/shutdown runs once"""
+    with TestClient(app) as c:
+        yield c
 
 
-@pytest.fixture(scope="function")
-def test_db():
-    """Create and clean up test database for each test"""
-    # Create tables
-    Base.metadata.create_all(bind=engine)
-    yield
-    # Drop tables
-    Base.metadata.drop_all(bind=engine)
+@pytest.fixture(scope="module")
+def openapi_spec(client):
+    """The served /openapi.json, fetched once per module"""
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    return response.json()
 
 
 @pytest.fixture
@@ -58,19 +51,85 @@ def sample_user_data():
 
 
 @pytest.fixture
-def sample_user_data_2():
-    """Second sample user data for testing"""
-    return {
-        "username": "testuser2",
-        "email": "test2@example.com", 
-        "password": "testpassword456"
-    }
+def seeded_users(db_session, sample_user_data, user_factory):
+    """Insert the sample users directly, without going through /auth/register"""
+    users = [sample_user_data, user_factory()]
+    db_session.bulk_save_objects([
+        User(
+            username=user["username"],
+            email=user["email"],
+            password_hash=get_password_hash(user["password"])
+        )
+        for user in users
+    ])
+    db_session.commit()
+    return users
+
+
+@pytest.fixture(scope="module")
+def module_seeded_user(engine, database_schema):
+    """Commit a user shared by the module's read-only tests, deleting it afterwards"""
+    db = TestingSessionLocal(bind=engine)
+    try:
+        user = User(
+            username=MODULE_USER["username"],
+            email=MODULE_USER["email"],
+            password_hash=get_password_hash(MODULE_USER["password"])
+        )
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+    
+    yield {**MODULE_USER, "id": user_id}
+    
+    db = TestingSessionLocal(bind=engine)
+    try:
+        db.query(User).filter(User.id == user_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def valid_token(module_seeded_user):
+    """Access token for the module user, signed once per module"""
+    return create_access_token(data={"sub": module_seeded_user["id"]})
+
+
+@pytest.fixture
+def authed_headers(client, seeded_users, sample_user_data):
+    """Log in the seeded sample user, returning its auth headers"""
+    login_response = client.post("/auth/login", json={
+        "username": sample_user_data["username"],
+        "password": sample_user_data["password"]
+    })
+    token = login_response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def user_factory():
+    """Build user data with a unique username and email on each call"""
+    counter = itertools.count(1)
+    
+    def make_user(**overrides):
+        i = next(counter)
+        return {
+            "username": f"testuser{i}",
+            "email": f"test{i}@example.com",
+            "password": "testpassword123",
+            **overrides
+        }
+    
+    return make_user
 
 
 class TestUserRegistration:
     """Test user registration endpoint"""
     
-    def test_successful_registration(self, test_db, sample_user_data):
+    def test_successful_registration(self, client, test_db, sample_user_data):
         """Test successful user registration"""
         response = client.post("/auth/register", json=sample_user_data)
         
@@ -86,11 +145,8 @@ class TestUserRegistration:
         assert "created_at" in data
         assert "updated_at" in data
     
-    def test_registration_with_existing_username(self, test_db, sample_user_data):
+    def test_registration_with_existing_username(self, client, seeded_users, sample_user_data):
         """Test registration with existing username"""
-        # Register first user
-        client.post("/auth/register", json=sample_user_data)
-        
         # Try to register with same username but different email
         duplicate_user = {
             "username": sample_user_data["username"],
@@ -104,11 +160,8 @@ class TestUserRegistration:
         assert response.status_code == 400
         assert "already exists" in response.json()["detail"].lower()
     
-    def test_registration_with_existing_email(self, test_db, sample_user_data):
+    def test_registration_with_existing_email(self, client, seeded_users, sample_user_data):
         """Test registration with existing email"""
-        # Register first user
-        client.post("/auth/register", json=sample_user_data)
-        
         # Try to register with same email but different username
         duplicate_user = {
             "username": "differentuser",
@@ -122,7 +175,7 @@ class TestUserRegistration:
         assert response.status_code == 400
         assert "already exists" in response.json()["detail"].lower()
     
-    def test_registration_with_invalid_email(self, test_db):
+    def test_registration_with_invalid_email(self, client, test_db):
         """Test registration with invalid email format"""
         invalid_user = {
             "username": "testuser",
@@ -135,7 +188,7 @@ class TestUserRegistration:
         # Should return 422 Validation Error
         assert response.status_code == 422
     
-    def test_registration_with_short_password(self, test_db):
+    def test_registration_with_short_password(self, client, test_db):
         """Test registration with too short password"""
         invalid_user = {
             "username": "testuser",
@@ -148,28 +201,23 @@ class TestUserRegistration:
         # Should return 422 Validation Error
         assert response.status_code == 422
     
-    def test_registration_with_missing_fields(self, test_db):
+    @pytest.mark.parametrize("user_data", [
+        pytest.param({"email": "test@example.com", "password": "testpassword123"}, id="missing-username"),
+        pytest.param({"username": "testuser", "password": "testpassword123"}, id="missing-email"),
+        pytest.param({"username": "testuser", "email": "test@example.com"}, id="missing-password"),
+        pytest.param({}, id="missing-all"),
+    ])
+    def test_registration_with_missing_fields(self, client, test_db, user_data):
         """Test registration with missing required fields"""
-        incomplete_users = [
-            {"email": "test@example.com", "password": "testpassword123"},  # Missing username
-            {"username": "testuser", "password": "testpassword123"},  # Missing email
-            {"username": "testuser", "email": "test@example.com"},  # Missing password
-            {}  # Missing all fields
-        ]
-        
-        for user_data in incomplete_users:
-            response = client.post("/auth/register", json=user_data)
-            assert response.status_code == 422
+        response = client.post("/auth/register", json=user_data)
+        assert response.status_code == 422
 
 
 class TestUserLogin:
     """Test user login endpoint"""
     
-    def test_successful_login(self, test_db, sample_user_data):
+    def test_successful_login(self, client, seeded_users, sample_user_data):
         """Test successful user login"""
-        # Register user first
-        client.post("/auth/register", json=sample_user_data)
-        
         # Login with correct credentials
         login_data = {
             "username": sample_user_data["username"],
@@ -188,11 +236,8 @@ class TestUserLogin:
         assert data["token_type"] == "bearer"
         assert len(data["access_token"]) > 0
     
-    def test_login_with_wrong_password(self, test_db, sample_user_data):
+    def test_login_with_wrong_password(self, client, seeded_users, sample_user_data):
         """Test login with incorrect password"""
-        # Register user first
-        client.post("/auth/register", json=sample_user_data)
-        
         # Login with wrong password
         login_data = {
             "username": sample_user_data["username"],
@@ -205,7 +250,7 @@ class TestUserLogin:
         assert response.status_code == 401
         assert "incorrect" in response.json()["detail"].lower()
     
-    def test_login_with_nonexistent_user(self, test_db):
+    def test_login_with_nonexistent_user(self, client, test_db):
         """Test login with non-existent username"""
         login_data = {
             "username": "nonexistentuser",
@@ -218,11 +263,8 @@ class TestUserLogin:
         assert response.status_code == 401
         assert "incorrect" in response.json()["detail"].lower()
     
-    def test_login_with_email_instead_of_username(self, test_db, sample_user_data):
+    def test_login_with_email_instead_of_username(self, client, seeded_users, sample_user_data):
         """Test login using email instead of username"""
-        # Register user first
-        client.post("/auth/register", json=sample_user_data)
-        
         # Try to login with email
         login_data = {
             "username": sample_user_data["email"],  # Using email as username
@@ -234,35 +276,24 @@ class TestUserLogin:
         # Should return 401 Unauthorized (email is not username)
         assert response.status_code == 401
     
-    def test_login_with_missing_fields(self, test_db):
+    @pytest.mark.parametrize("login_data", [
+        pytest.param({"password": "testpassword123"}, id="missing-username"),
+        pytest.param({"username": "testuser"}, id="missing-password"),
+        pytest.param({}, id="missing-both"),
+    ])
+    def test_login_with_missing_fields(self, client, test_db, login_data):
         """Test login with missing fields"""
-        incomplete_logins = [
-            {"password": "testpassword123"},  # Missing username
-            {"username": "testuser"},  # Missing password
-            {}  # Missing both fields
-        ]
-        
-        for login_data in incomplete_logins:
-            response = client.post("/auth/login", json=login_data)
-            assert response.status_code == 422
+        response = client.post("/auth/login", json=login_data)
+        assert response.status_code == 422
 
 
 class TestProtectedRoutes:
     """Test protected routes and authentication middleware"""
     
-    def test_access_protected_route_with_valid_token(self, test_db, sample_user_data):
+    def test_access_protected_route_with_valid_token(self, client, test_db, valid_token, module_seeded_user):
         """Test accessing protected route with valid token"""
-        # Register and login user
-        client.post("/auth/register", json=sample_user_data)
-        
-        login_response = client.post("/auth/login", json={
-            "username": sample_user_data["username"],
-            "password": sample_user_data["password"]
-        })
-        token = login_response.json()["access_token"]
-        
         # Access protected route with valid token
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = {"Authorization": f"Bearer {valid_token}"}
         response = client.get("/auth/me", headers=headers)
         
         # Should return 200 OK
@@ -270,19 +301,19 @@ class TestProtectedRoutes:
         
         # Check response data
         data = response.json()
-        assert data["username"] == sample_user_data["username"]
-        assert data["email"] == sample_user_data["email"]
+        assert data["username"] == module_seeded_user["username"]
+        assert data["email"] == module_seeded_user["email"]
         assert "password" not in data
         assert "id" in data
     
-    def test_access_protected_route_without_token(self, test_db):
+    def test_access_protected_route_without_token(self, client, test_db):
         """Test accessing protected route without token"""
         response = client.get("/auth/me")
         
         # Should return 401 Unauthorized
         assert response.status_code == 401
     
-    def test_access_protected_route_with_invalid_token(self, test_db):
+    def test_access_protected_route_with_invalid_token(self, client, test_db):
         """Test accessing protected route with invalid token"""
         headers = {"Authorization": "Bearer invalid_token_here"}
         response = client.get("/auth/me", headers=headers)
@@ -290,20 +321,18 @@ class TestProtectedRoutes:
         # Should return 401 Unauthorized
         assert response.status_code == 401
     
-    def test_access_protected_route_with_malformed_header(self, test_db):
+    @pytest.mark.parametrize("headers", [
+        pytest.param({"Authorization": "invalid_format_token"}, id="missing-bearer"),
+        pytest.param({"Authorization": "Bearer"}, id="missing-token"),
+        pytest.param({"Authorization": "Token abc123"}, id="wrong-scheme"),
+        pytest.param({"Authorization": ""}, id="empty-header"),
+    ])
+    def test_access_protected_route_with_malformed_header(self, client, test_db, headers):
         """Test accessing protected route with malformed authorization header"""
-        malformed_headers = [
-            {"Authorization": "invalid_format_token"},  # Missing Bearer
-            {"Authorization": "Bearer"},  # Missing token
-            {"Authorization": "Token abc123"},  # Wrong scheme
-            {"Authorization": ""},  # Empty header
-        ]
-        
-        for headers in malformed_headers:
-            response = client.get("/auth/me", headers=headers)
-            assert response.status_code == 401
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 401
     
-    def test_access_protected_route_with_expired_token(self, test_db, sample_user_data):
+    def test_access_protected_route_with_expired_token(self, client, test_db, sample_user_data):
         """Test accessing protected route with expired token"""
         # This test would require mocking time or creating an expired token
         # For now, we'll test with an obviously invalid token structure
@@ -317,33 +346,23 @@ class TestProtectedRoutes:
 class TestUserLogout:
     """Test user logout endpoint"""
     
-    def test_successful_logout(self, test_db, sample_user_data):
+    def test_successful_logout(self, client, authed_headers):
         """Test successful user logout"""
-        # Register and login user
-        client.post("/auth/register", json=sample_user_data)
-        
-        login_response = client.post("/auth/login", json={
-            "username": sample_user_data["username"],
-            "password": sample_user_data["password"]
-        })
-        token = login_response.json()["access_token"]
-        
         # Logout with valid token
-        headers = {"Authorization": f"Bearer {token}"}
-        response = client.post("/auth/logout", headers=headers)
+        response = client.post("/auth/logout", headers=authed_headers)
         
         # Should return 200 OK
         assert response.status_code == 200
         assert "successfully" in response.json()["message"].lower()
     
-    def test_logout_without_token(self, test_db):
+    def test_logout_without_token(self, client, test_db):
         """Test logout without token"""
         response = client.post("/auth/logout")
         
         # Should return 401 Unauthorized
         assert response.status_code == 401
     
-    def test_logout_with_invalid_token(self, test_db):
+    def test_logout_with_invalid_token(self, client, test_db):
         """Test logout with invalid token"""
         headers = {"Authorization": "Bearer invalid_token"}
         response = client.post("/auth/logout", headers=headers)
@@ -355,7 +374,7 @@ class TestUserLogout:
 class TestAuthenticationFlow:
     """Test complete authentication flows"""
     
-    def test_complete_registration_login_profile_flow(self, test_db, sample_user_data):
+    def test_complete_registration_login_profile_flow(self, client, test_db, sample_user_data):
         """Test complete flow: register -> login -> access profile"""
         # Step 1: Register user
         register_response = client.post("/auth/register", json=sample_user_data)
@@ -380,65 +399,42 @@ class TestAuthenticationFlow:
         assert profile_data["username"] == sample_user_data["username"]
         assert profile_data["email"] == sample_user_data["email"]
     
-    def test_multiple_user_registration_and_login(self, test_db, sample_user_data, sample_user_data_2):
+    def test_multiple_user_registration_and_login(self, client, test_db, user_factory):
         """Test multiple users can register and login independently"""
-        # Register first user
-        response1 = client.post("/auth/register", json=sample_user_data)
-        assert response1.status_code == 201
-        
-        # Register second user
-        response2 = client.post("/auth/register", json=sample_user_data_2)
-        assert response2.status_code == 201
-        
-        # Both users should be able to login
-        login1 = client.post("/auth/login", json={
-            "username": sample_user_data["username"],
-            "password": sample_user_data["password"]
-        })
-        assert login1.status_code == 200
-        
-        login2 = client.post("/auth/login", json={
-            "username": sample_user_data_2["username"],
-            "password": sample_user_data_2["password"]
-        })
-        assert login2.status_code == 200
+        users = [user_factory(), user_factory()]
+        
+        # Register all users
+        responses = [client.post("/auth/register", json=user) for user in users]
+        assert all(response.status_code == 201 for response in responses)
+        
+        # Every user should be able to login
+        logins = [
+            client.post("/auth/login", json={
+                "username": user["username"],
+                "password": user["password"]
+            })
+            for user in users
+        ]
+        assert all(login.status_code == 200 for login in logins)
         
         # Tokens should be different
-        token1 = login1.json()["access_token"]
-        token2 = login2.json()["access_token"]
-        assert token1 != token2
+        tokens = [login.json()["access_token"] for login in logins]
+        assert len(set(tokens)) == len(users)
         
         # Each user should access their own profile
-        headers1 = {"Authorization": f"Bearer {token1}"}
-        headers2 = {"Authorization": f"Bearer {token2}"}
-        
-        profile1 = client.get("/auth/me", headers=headers1)
-        profile2 = client.get("/auth/me", headers=headers2)
-        
-        assert profile1.status_code == 200
-        assert profile2.status_code == 200
-        
-        assert profile1.json()["username"] == sample_user_data["username"]
-        assert profile2.json()["username"] == sample_user_data_2["username"]
+        for user, token in zip(users, tokens):
+            profile = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+            assert profile.status_code == 200
+            assert profile.json()["username"] == user["username"]
     
-    def test_token_invalidation_after_logout(self, test_db, sample_user_data):
+    def test_token_invalidation_after_logout(self, client, authed_headers):
         """Test that token cannot be used after logout (if implemented)"""
-        # Register and login user
-        client.post("/auth/register", json=sample_user_data)
-        
-        login_response = client.post("/auth/login", json={
-            "username": sample_user_data["username"],
-            "password": sample_user_data["password"]
-        })
-        token = login_response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
         # Verify token works before logout
-        response = client.get("/auth/me", headers=headers)
+        response = client.get("/auth/me", headers=authed_headers)
         assert response.status_code == 200
         
         # Logout
-        logout_response = client.post("/auth/logout", headers=headers)
+        logout_response = client.post("/auth/logout", headers=authed_headers)
         assert logout_response.status_code == 200
         
         # Note: Token invalidation after logout requires additional implementation
@@ -449,7 +445,8 @@ class TestAuthenticationFlow:
 class TestEdgeCases:
     """Test edge cases and error conditions"""
     
-    def test_registration_with_unicode_characters(self, test_db):
+    @pytest.mark.slow
+    def test_registration_with_unicode_characters(self, client, test_db):
         """Test registration with unicode characters in username"""
         unicode_user = {
             "username": "тестユーザー",
@@ -463,7 +460,8 @@ class TestEdgeCases:
         assert response.status_code == 201
         assert response.json()["username"] == unicode_user["username"]
     
-    def test_very_long_username_and_email(self, test_db):
+    @pytest.mark.slow
+    def test_very_long_username_and_email(self, client, test_db):
         """Test registration with very long username and email"""
         long_user = {
             "username": "a" * 100,  # Very long username
@@ -478,24 +476,23 @@ class TestEdgeCases:
             assert response.json()["username"] == long_user["username"]
         elif response.status_code == 422:
             # Validation error for too long fields is also acceptable
-            assert "too long" in str(response.json()).lower() or "length" in str(response.json()).lower()
+            error_text = str(response.json()).lower()
+            assert "too long" in error_text or "length" in error_text
     
-    def test_case_sensitivity_in_usernames(self, test_db):
-        """Test case sensitivity in usernames"""
+    def test_case_sensitivity_in_usernames(self, client, test_db):
+        """Test that usernames differing only in case are distinct users"""
         user1 = {"username": "TestUser", "email": "test1@example.com", "password": "password123"}
         user2 = {"username": "testuser", "email": "test2@example.com", "password": "password123"}
         
-        # Register both users
         response1 = client.post("/auth/register", json=user1)
         response2 = client.post("/auth/register", json=user2)
         
-        # Both should succeed if usernames are case-sensitive
-        # Or second should fail if usernames are case-insensitive
+        # Usernames are compared exactly, so both registrations succeed
         assert response1.status_code == 201
-        # Response2 result depends on implementation choice
+        assert response2.status_code == 201
     
-    def test_whitespace_in_credentials(self, test_db):
-        """Test handling of whitespace in usernames and passwords"""
+    def test_whitespace_in_credentials(self, client, test_db):
+        """Test that whitespace in usernames and passwords is kept as given"""
         user_with_spaces = {
             "username": "  spaced_user  ",
             "email": "spaces@example.com",
@@ -504,29 +501,21 @@ class TestEdgeCases:
         
         response = client.post("/auth/register", json=user_with_spaces)
         
-        # Implementation should decide whether to trim or reject
-        # Test assumes trimming is implemented
-        if response.status_code == 201:
-            # Login should work with original (spaced) or trimmed credentials
-            login_attempts = [
-                {"username": "  spaced_user  ", "password": "  password123  "},
-                {"username": "spaced_user", "password": "password123"}
-            ]
-            
-            success_found = False
-            for login_data in login_attempts:
-                login_response = client.post("/auth/login", json=login_data)
-                if login_response.status_code == 200:
-                    success_found = True
-                    break
-            
-            assert success_found, "Login should work with either spaced or trimmed credentials"
+        # Credentials are stored verbatim, not trimmed or rejected
+        assert response.status_code == 201
+        assert response.json()["username"] == user_with_spaces["username"]
+        
+        login_response = client.post("/auth/login", json={
+            "username": user_with_spaces["username"],
+            "password": user_with_spaces["password"]
+        })
+        assert login_response.status_code == 200
 
 
 class TestAPIDocumentation:
     """Test API endpoint documentation and responses"""
     
-    def test_root_endpoint(self, test_db):
+    def test_root_endpoint(self, client, test_db):
         """Test root endpoint returns proper information"""
         response = client.get("/")
         
@@ -535,12 +524,8 @@ class TestAPIDocumentation:
         assert "message" in data
         assert "version" in data
     
-    def test_openapi_docs_accessible(self, test_db):
+    def test_openapi_docs_accessible(self, client, openapi_spec):
         """Test that OpenAPI documentation is accessible"""
-        response = client.get("/openapi.json")
-        
-        assert response.status_code == 200
-        openapi_spec = response.json()
         assert "openapi" in openapi_spec
         assert "paths" in openapi_spec
         
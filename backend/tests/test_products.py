@@ -1,6 +1,7 @@
 """
 Unit and integration tests for product management API
 """
+import json
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -247,7 +248,33 @@ class TestProductRetrieval:
         assert response.status_code == 200
         data = response.json()
         assert len(data["products"]) == 5
-    
+
+    def test_get_products_cursor_pagination(self, test_db, authenticated_user, sample_category):
+        """Test keyset pagination matches offset pagination"""
+        for i in range(15):
+            client.post(
+                "/products/",
+                json={"title": f"Product {i}", "price": 10.0 + i, "category_id": sample_category.id},
+                headers=authenticated_user["headers"]
+            )
+
+        page1 = client.get("/products/?page=1&per_page=10").json()
+        page2 = client.get("/products/?page=2&per_page=10").json()
+        assert page1["next_cursor"] == page1["products"][-1]["id"]
+
+        # Follow the cursor instead of the page number
+        response = client.get(f"/products/?after_id={page1['next_cursor']}&per_page=10")
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["id"] for p in data["products"]] == [p["id"] for p in page2["products"]]
+        assert data["total"] is None
+        assert data["next_cursor"] is None
+
+    def test_get_products_invalid_cursor(self, test_db):
+        """Test keyset pagination with unknown cursor"""
+        response = client.get("/products/?after_id=nonexistent-id")
+        assert response.status_code == 400
+
     def test_get_products_filter_by_category(self, test_db, authenticated_user, sample_category):
         """Test filtering products by category"""
         # Create another category
@@ -520,6 +547,22 @@ class TestSellerProducts:
         assert data["total"] == 3
         assert len(data["products"]) == 3
     
+    def test_export_seller_products(self, test_db, authenticated_user, sample_category):
+        """Test streaming seller products as NDJSON"""
+        for i in range(3):
+            client.post(
+                "/products/",
+                json={"title": f"Product {i}", "price": 10.0 + i, "category_id": sample_category.id},
+                headers=authenticated_user["headers"]
+            )
+        
+        response = client.get(f"/products/seller/{authenticated_user['user'].id}/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 3
+        assert {p["title"] for p in lines} == {"Product 0", "Product 1", "Product 2"}
+    
     def test_get_seller_products_not_found(self, test_db):
         """Test getting products for non-existent seller"""
         response = client.get("/products/seller/non-existent-seller")